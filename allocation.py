@@ -0,0 +1,240 @@
+from bisect import bisect_left, bisect_right, insort
+
+from date import Date
+
+
+class DemandeReservation:
+    """Classe représentant une demande de réservation en attente d'affectation"""
+    
+    def __init__(self, id_demande, type_vehicule, date_debut, date_fin, marque=None):
+        """
+        Initialise une demande de réservation
+        
+        Args:
+            id_demande (str): L'identifiant de la demande
+            type_vehicule (str): Le type de véhicule demandé ("Voiture" ou "Camion")
+            date_debut (Date): La date de début souhaitée
+            date_fin (Date): La date de fin souhaitée
+            marque (str, optional): La marque exigée, None pour toutes. Defaults to None.
+        
+        Raises:
+            TypeError: Si les dates ne sont pas des instances de la classe Date
+            ValueError: Si le type est inconnu ou si la date de fin précède la date de début
+        """
+        if not isinstance(date_debut, Date) or not isinstance(date_fin, Date):
+            raise TypeError("Les dates doivent être des instances de la classe Date")
+        if type_vehicule.lower() not in ("voiture", "camion"):
+            raise ValueError("Le type de véhicule doit être \"Voiture\" ou \"Camion\"")
+        
+        self._id_demande = id_demande
+        self._type_vehicule = type_vehicule
+        self._date_debut = date_debut
+        self._date_fin = date_fin
+        self._marque = marque
+        self._debut = date_debut.vers_ordinal()
+        self._fin = date_fin.vers_ordinal()
+        if self._fin < self._debut:
+            raise ValueError("La date de fin ne peut pas être antérieure à la date de début")
+    
+    def get_id_demande(self):
+        """Retourne l'identifiant de la demande"""
+        return self._id_demande
+    
+    def get_type_vehicule(self):
+        """Retourne le type de véhicule demandé"""
+        return self._type_vehicule
+    
+    def get_date_debut(self):
+        """Retourne la date de début souhaitée"""
+        return self._date_debut
+    
+    def get_date_fin(self):
+        """Retourne la date de fin souhaitée"""
+        return self._date_fin
+    
+    def get_marque(self):
+        """Retourne la marque exigée, ou None"""
+        return self._marque
+    
+    def jour_debut(self):
+        """Retourne la date de début sous forme d'ordinal (voir Date.vers_ordinal)"""
+        return self._debut
+    
+    def jour_fin(self):
+        """Retourne la date de fin sous forme d'ordinal (voir Date.vers_ordinal)"""
+        return self._fin
+
+
+class ResultatAllocation:
+    """Résultat d'une allocation : affectations retenues et demandes non satisfaites"""
+    
+    def __init__(self, affectations, non_satisfaites, nb_vehicules):
+        """
+        Initialise un résultat d'allocation
+        
+        Args:
+            affectations (list): Les couples (demande, véhicule) retenus
+            non_satisfaites (list): Les demandes sans véhicule
+            nb_vehicules (int): Le nombre de véhicules qui pouvaient être affectés
+        """
+        self._affectations = affectations
+        self._non_satisfaites = non_satisfaites
+        self._nb_vehicules = nb_vehicules
+    
+    def get_affectations(self):
+        """Retourne la liste des couples (demande, véhicule) retenus"""
+        return self._affectations
+    
+    def get_non_satisfaites(self):
+        """Retourne la liste des demandes sans véhicule"""
+        return self._non_satisfaites
+    
+    def vehicule_de(self, id_demande):
+        """
+        Retourne le véhicule affecté à une demande
+        
+        Args:
+            id_demande (str): L'identifiant de la demande
+        
+        Returns:
+            Vehicule: Le véhicule affecté, ou None si la demande n'est pas satisfaite
+        """
+        for demande, vehicule in self._affectations:
+            if demande.get_id_demande() == id_demande:
+                return vehicule
+        return None
+    
+    def taux_satisfaction(self):
+        """Retourne la part des demandes satisfaites (entre 0 et 1)"""
+        total = len(self._affectations) + len(self._non_satisfaites)
+        return len(self._affectations) / total if total else 1.0
+    
+    def nb_vehicules_utilises(self):
+        """Retourne le nombre de véhicules distincts ayant reçu au moins une demande"""
+        return len({id(vehicule) for _, vehicule in self._affectations})
+    
+    def afficher(self):
+        """
+        Affiche un résumé de l'allocation
+        
+        Returns:
+            str: Une chaîne contenant le résumé de l'allocation
+        """
+        info = f"Demandes satisfaites: {len(self._affectations)}, non satisfaites: {len(self._non_satisfaites)}\n"
+        info += f"Taux de satisfaction: {self.taux_satisfaction() * 100:.1f}%\n"
+        info += f"Véhicules utilisés: {self.nb_vehicules_utilises()} sur {self._nb_vehicules}"
+        return info
+
+
+class Allocateur:
+    """
+    Affecte en lot des véhicules du parc à des demandes de réservation
+    
+    Pour chaque type de véhicule, les demandes sont traitées par date de fin
+    croissante et chacune reçoit, parmi les véhicules libres à sa date de
+    début, celui qui s'est libéré le plus tard (meilleur ajustement). Sans
+    contrainte de marque, cet ordre maximise le nombre de demandes satisfaites
+    sur des véhicules interchangeables ; le meilleur ajustement laisse les
+    véhicules libérés tôt aux demandes suivantes et limite les jours inutilisés.
+    
+    Avec des marques exigées, l'optimum n'est plus garanti ; deux règles
+    évitent qu'une demande sans marque prenne le véhicule dont une demande
+    avec marque aura besoin. À date de fin égale, les demandes avec marque
+    passent d'abord. Une demande sans marque prend un véhicule de la marque
+    la moins sollicitée pendant sa période : celle dont les demandes avec
+    marque restant à traiter et chevauchant cette période sont les moins
+    nombreuses par véhicule.
+    
+    Un véhicule rendu le jour J peut être affecté à une demande commençant le
+    jour J ; une demande qui commence et finit le même jour occupe ce jour-là.
+    Seuls les véhicules disponibles au moment de l'allocation sont affectés.
+    """
+    
+    def __init__(self, parc):
+        """
+        Initialise un allocateur sur un parc automobile
+        
+        Args:
+            parc (ParcAuto): Le parc dont les véhicules sont affectés
+        """
+        self._parc = parc
+    
+    def allouer(self, demandes):
+        """
+        Affecte des véhicules à une liste de demandes
+        
+        Aucune location n'est créée : le résultat indique quel véhicule
+        réserver pour chaque demande satisfaite.
+        
+        Args:
+            demandes (list): Les demandes de réservation (DemandeReservation)
+        
+        Returns:
+            ResultatAllocation: Les affectations et les demandes non satisfaites
+        """
+        par_type = {}
+        for demande in demandes:
+            par_type.setdefault(demande.get_type_vehicule().lower(), []).append(demande)
+        
+        affectations = []
+        non_satisfaites = []
+        nb_vehicules = 0
+        for type_vehicule, demandes_type in par_type.items():
+            vehicules = self._parc.requete(type_vehicule=type_vehicule, disponible=True).liste()
+            nb_vehicules += len(vehicules)
+            self._allouer_type(vehicules, demandes_type, affectations, non_satisfaites)
+        
+        return ResultatAllocation(affectations, non_satisfaites, nb_vehicules)
+    
+    def _allouer_type(self, vehicules, demandes, affectations, non_satisfaites):
+        """Alloue les véhicules d'un même type, groupés par marque"""
+        # Par marque, liste triée de (libre à partir de, rang, véhicule) ;
+        # le rang départage les égalités sans comparer les véhicules
+        libres = {}
+        for rang, vehicule in enumerate(vehicules):
+            libres.setdefault(vehicule.get_marque().lower(), []).append((0, rang, vehicule))
+        taille_groupes = {marque: len(groupe) for marque, groupe in libres.items()}
+        
+        # Une demande occupe au moins un jour, comme pour le prix d'une location
+        def fin_occupation(demande):
+            return max(demande.jour_fin(), demande.jour_debut() + 1)
+        
+        # Par marque, jours de début triés des demandes avec cette marque restant à traiter.
+        # Elles finissent au plus tôt avec la demande en cours : celles qui commencent
+        # avant sa fin la chevauchent.
+        debuts_restants = {}
+        for demande in demandes:
+            if demande.get_marque() is not None:
+                debuts_restants.setdefault(demande.get_marque().lower(), []).append(demande.jour_debut())
+        for debuts in debuts_restants.values():
+            debuts.sort()
+        
+        for demande in sorted(demandes, key=lambda d: (fin_occupation(d), d.get_marque() is None, d.jour_debut())):
+            if demande.get_marque() is None:
+                marques = libres.keys()
+            else:
+                marques = (demande.get_marque().lower(),)
+                debuts = debuts_restants[marques[0]]
+                del debuts[bisect_left(debuts, demande.jour_debut())]
+            
+            # Dans chaque groupe, le dernier véhicule libéré au plus tard le jour de début ;
+            # entre groupes, la marque la moins sollicitée, puis le meilleur ajustement
+            meilleur, meilleure_cle, meilleur_groupe, meilleure_position = None, None, None, None
+            for marque in marques:
+                groupe = libres.get(marque, [])
+                position = bisect_right(groupe, (demande.jour_debut(), len(vehicules))) - 1
+                if position < 0:
+                    continue
+                sollicitation = bisect_left(debuts_restants.get(marque, ()), fin_occupation(demande))
+                cle = (-sollicitation / taille_groupes[marque], groupe[position])
+                if meilleure_cle is None or cle > meilleure_cle:
+                    meilleure_cle, meilleur_groupe, meilleure_position = cle, groupe, position
+                    meilleur = groupe[position]
+            
+            if meilleur is None:
+                non_satisfaites.append(demande)
+                continue
+            
+            _, rang, vehicule = meilleur_groupe.pop(meilleure_position)
+            insort(meilleur_groupe, (fin_occupation(demande), rang, vehicule))
+            affectations.append((demande, vehicule))
\ No newline at end of file
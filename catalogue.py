@@ -0,0 +1,158 @@
+import sys
+import threading
+import weakref
+
+
+class FicheVehicule:
+    """
+    Caractéristiques immuables partagées par tous les véhicules identiques
+    
+    Une fiche regroupe la marque, le modèle, l'année et la caractéristique
+    propre au type de véhicule (nombre de portes ou capacité), ainsi que les
+    clés normalisées (en minuscules) de la marque et du modèle. Les fiches
+    sont créées par un CatalogueFiches : deux véhicules identiques partagent
+    la même fiche, et deux fiches sont égales si et seulement si elles sont
+    le même objet.
+    
+    La fiche garde aussi en cache, pour chaque disponibilité, la chaîne
+    retournée par afficher_info() : elle sert à tous les véhicules de la fiche.
+    """
+    
+    __slots__ = ("_classe", "_marque", "_modele", "_annee", "_detail",
+                 "_cle_marque", "_cle_modele", "_infos", "__weakref__")
+    
+    def __init__(self, classe, marque, modele, annee, detail, cle_marque, cle_modele):
+        """
+        Initialise une fiche ; utiliser CatalogueFiches.fiche()
+        
+        Args:
+            classe (type): La classe des véhicules de la fiche
+            marque (str): La marque (internée)
+            modele (str): Le modèle (interné)
+            annee (int): L'année de fabrication
+            detail: Le nombre de portes d'une voiture ou la capacité d'un camion
+            cle_marque (str): La marque en minuscules (internée)
+            cle_modele (str): Le modèle en minuscules (interné)
+        """
+        self._classe = classe
+        self._marque = marque
+        self._modele = modele
+        self._annee = annee
+        self._detail = detail
+        self._cle_marque = cle_marque
+        self._cle_modele = cle_modele
+        # Chaînes d'afficher_info() : [non disponible, disponible]
+        self._infos = [None, None]
+    
+    def get_classe(self):
+        """Retourne la classe des véhicules de la fiche"""
+        return self._classe
+    
+    def get_marque(self):
+        """Retourne la marque"""
+        return self._marque
+    
+    def get_modele(self):
+        """Retourne le modèle"""
+        return self._modele
+    
+    def get_annee(self):
+        """Retourne l'année de fabrication"""
+        return self._annee
+    
+    def get_detail(self):
+        """Retourne le nombre de portes (voiture) ou la capacité (camion)"""
+        return self._detail
+    
+    def get_cle_marque(self):
+        """Retourne la marque en minuscules, internée"""
+        return self._cle_marque
+    
+    def get_cle_modele(self):
+        """Retourne le modèle en minuscules, interné"""
+        return self._cle_modele
+    
+    def info_en_cache(self, disponible):
+        """Retourne la chaîne d'afficher_info() en cache pour une disponibilité, ou None"""
+        return self._infos[bool(disponible)]
+    
+    def memoriser_info(self, disponible, info):
+        """Place en cache la chaîne d'afficher_info() pour une disponibilité"""
+        self._infos[bool(disponible)] = info
+
+
+class CatalogueFiches:
+    """
+    Catalogue des fiches de véhicules et des chaînes de marque et de modèle
+    
+    Les chaînes sont internées : une même marque n'est stockée qu'une fois,
+    quel que soit le nombre de véhicules, et sa forme normalisée (minuscules)
+    n'est calculée qu'à la création d'une fiche. Le catalogue ne garde pas
+    les fiches en vie : une fiche disparaît avec le dernier véhicule qui
+    l'utilise.
+    """
+    
+    def __init__(self):
+        """Initialise un catalogue vide"""
+        self._fiches = weakref.WeakValueDictionary()
+        self._verrou = threading.Lock()
+    
+    def interner(self, chaine):
+        """
+        Retourne l'exemplaire unique d'une chaîne
+        
+        Args:
+            chaine (str): La chaîne ; une autre valeur est retournée telle quelle
+        
+        Returns:
+            str: Une chaîne égale, partagée par tous ses utilisateurs
+        """
+        return sys.intern(chaine) if type(chaine) is str else chaine
+    
+    def cle(self, chaine):
+        """
+        Retourne la forme normalisée (minuscules), internée, d'une chaîne
+        
+        Args:
+            chaine (str): La marque ou le modèle ; une autre valeur (None...) est
+                retournée telle quelle et ne correspond à aucun critère de recherche
+        
+        Returns:
+            str: La chaîne en minuscules
+        """
+        return self.interner(chaine.lower()) if isinstance(chaine, str) else chaine
+    
+    def fiche(self, classe, marque, modele, annee, detail):
+        """
+        Retourne la fiche partagée correspondant à des caractéristiques
+        
+        Args:
+            classe (type): La classe du véhicule
+            marque (str): La marque
+            modele (str): Le modèle
+            annee (int): L'année de fabrication
+            detail: Le nombre de portes d'une voiture ou la capacité d'un camion
+        
+        Returns:
+            FicheVehicule: La fiche, créée à la première demande
+        """
+        # Les types font partie de la clé : 4 et 4.0 sont égaux mais ne s'affichent pas pareil
+        cle = (classe, marque, modele, annee, type(annee), detail, type(detail))
+        fiche = self._fiches.get(cle)
+        if fiche is None:
+            # Sous verrou : deux threads ne doivent pas créer deux fiches identiques
+            with self._verrou:
+                fiche = self._fiches.get(cle)
+                if fiche is None:
+                    fiche = self._fiches[cle] = FicheVehicule(
+                        classe, self.interner(marque), self.interner(modele), annee, detail,
+                        self.cle(marque), self.cle(modele))
+        return fiche
+    
+    def nb_fiches(self):
+        """Retourne le nombre de fiches distinctes utilisées par des véhicules"""
+        return len(self._fiches)
+
+
+# Catalogue utilisé par tous les véhicules
+CATALOGUE = CatalogueFiches()
\ No newline at end of file
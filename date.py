@@ -1,6 +1,11 @@
+from datetime import date as _date_iso
+
 class Date:
     """Classe représentant une date"""
     
+    # Nombre de modifications de toutes les dates (voir nb_modifications)
+    _nb_modifications = 0
+    
     def __init__(self, jour, mois, annee):
         """
         Initialise une date avec son jour, son mois et son année
@@ -20,6 +25,32 @@ class Date:
         self._jour = jour
         self._mois = mois
         self._annee = annee
+        self._version = 0  # Incrémentée à chaque modification (voir get_version)
+    
+    def get_version(self):
+        """
+        Retourne le numéro de version de la date, incrémenté par chaque setter
+        
+        Permet aux objets qui gardent en cache un calcul fait sur la date
+        (durée, prix d'une location) de savoir si elle a changé depuis.
+        
+        Returns:
+            int: La version courante de la date
+        """
+        return self._version
+    
+    @staticmethod
+    def nb_modifications():
+        """
+        Retourne le nombre total de modifications faites par les setters, toutes dates confondues
+        
+        Permet de vérifier d'un coup qu'aucune date d'un ensemble n'a changé,
+        sans consulter la version de chacune.
+        
+        Returns:
+            int: Le nombre de modifications depuis le chargement du module
+        """
+        return Date._nb_modifications
     
     # Getters et setters pour jour
     def get_jour(self):
@@ -39,6 +70,8 @@ class Date:
         if not self._est_date_valide(jour, self._mois, self._annee):
             raise ValueError("Jour invalide")
         self._jour = jour
+        self._version += 1
+        Date._nb_modifications += 1
     
     # Getters et setters pour mois
     def get_mois(self):
@@ -58,6 +91,8 @@ class Date:
         if not self._est_date_valide(self._jour, mois, self._annee):
             raise ValueError("Mois invalide")
         self._mois = mois
+        self._version += 1
+        Date._nb_modifications += 1
     
     # Getters et setters pour annee
     def get_annee(self):
@@ -77,6 +112,8 @@ class Date:
         if not self._est_date_valide(self._jour, self._mois, annee):
             raise ValueError("Année invalide")
         self._annee = annee
+        self._version += 1
+        Date._nb_modifications += 1
     
     def _est_date_valide(self, jour, mois, annee):
         """
@@ -125,6 +162,32 @@ class Date:
         """
         return f"{self.get_jour():02d}/{self.get_mois():02d}/{self.get_annee():04d}"
     
+    def vers_ordinal(self):
+        """
+        Convertit la date en numéro de jour du calendrier grégorien proleptique
+        
+        Returns:
+            int: Le numéro du jour (1 pour le 01/01/0001)
+        
+        Raises:
+            ValueError: Si l'année est hors de l'intervalle 1-9999
+        """
+        return _date_iso(self._annee, self._mois, self._jour).toordinal()
+    
+    @classmethod
+    def depuis_ordinal(cls, ordinal):
+        """
+        Crée une date à partir de son numéro de jour
+        
+        Args:
+            ordinal (int): Le numéro du jour, tel que retourné par vers_ordinal()
+        
+        Returns:
+            Date: La date correspondante
+        """
+        d = _date_iso.fromordinal(ordinal)
+        return cls(d.day, d.month, d.year)
+    
     def difference(self, autre_date):
         """
         Calcule le nombre de jours entre cette date et une autre date
@@ -0,0 +1,264 @@
+class Evenement:
+    """Classe de base des événements publiés par les objets du domaine"""
+    
+    def __init__(self, source):
+        """
+        Initialise un événement avec l'objet qui l'a émis
+        
+        Args:
+            source (object): L'objet dont l'état a changé
+        """
+        self.source = source
+
+
+class VehiculeModifie(Evenement):
+    """Événement publié quand un attribut d'un véhicule est modifié par un setter"""
+    
+    def __init__(self, source, attribut, ancienne_valeur, nouvelle_valeur):
+        """
+        Initialise un événement de modification d'attribut
+        
+        Args:
+            source (Vehicule): Le véhicule modifié
+            attribut (str): Le nom de l'attribut modifié ("marque", "modele", "annee", ...)
+            ancienne_valeur (object): La valeur avant la modification
+            nouvelle_valeur (object): La valeur après la modification
+        """
+        super().__init__(source)
+        self.attribut = attribut
+        self.ancienne_valeur = ancienne_valeur
+        self.nouvelle_valeur = nouvelle_valeur
+
+
+class VehiculeLoue(Evenement):
+    """Événement publié quand un véhicule disponible est loué"""
+
+
+class VehiculeRendu(Evenement):
+    """Événement publié quand un véhicule loué est rendu"""
+
+
+class VehiculeAjoute(Evenement):
+    """Événement publié quand un véhicule est ajouté à un parc automobile"""
+    
+    def __init__(self, source, vehicule):
+        """
+        Initialise un événement d'ajout de véhicule
+        
+        Args:
+            source (ParcAuto): Le parc automobile modifié
+            vehicule (Vehicule): Le véhicule ajouté
+        """
+        super().__init__(source)
+        self.vehicule = vehicule
+
+
+class VehiculeSupprime(Evenement):
+    """Événement publié quand un véhicule est supprimé d'un parc automobile"""
+    
+    def __init__(self, source, vehicule):
+        """
+        Initialise un événement de suppression de véhicule
+        
+        Args:
+            source (ParcAuto): Le parc automobile modifié
+            vehicule (Vehicule): Le véhicule supprimé
+        """
+        super().__init__(source)
+        self.vehicule = vehicule
+
+
+class LocationModifiee(Evenement):
+    """Événement publié quand un attribut d'une location est modifié par un setter"""
+    
+    def __init__(self, source, attribut, ancienne_valeur, nouvelle_valeur):
+        """
+        Initialise un événement de modification de location
+        
+        Args:
+            source (Location): La location modifiée
+            attribut (str): Le nom de l'attribut modifié ("client", "vehicule", "date_debut", "date_fin")
+            ancienne_valeur (object): La valeur avant la modification
+            nouvelle_valeur (object): La valeur après la modification
+        """
+        super().__init__(source)
+        self.attribut = attribut
+        self.ancienne_valeur = ancienne_valeur
+        self.nouvelle_valeur = nouvelle_valeur
+
+
+class LocationTerminee(Evenement):
+    """Événement publié quand une location est terminée"""
+    
+    def __init__(self, source, date_fin):
+        """
+        Initialise un événement de fin de location
+        
+        Args:
+            source (Location): La location terminée
+            date_fin (Date): La date de fin de la location
+        """
+        super().__init__(source)
+        self.date_fin = date_fin
+
+
+class BusEvenements:
+    """
+    Bus de publication/abonnement attaché à un objet observable
+    
+    La livraison est synchrone par défaut : chaque abonné est appelé pendant
+    publier(). Entre debut_lot() et fin_lot(), les événements sont mis en
+    attente puis livrés dans leur ordre de publication à la fin du lot, sauf
+    aux abonnés immédiats, qui les reçoivent toujours pendant publier() (un
+    index ou un instantané ne doit pas rester faux le temps d'un lot).
+    """
+    
+    def __init__(self):
+        """Initialise un bus sans abonné"""
+        self._abonnes = []
+        self._lot = None
+        self._profondeur_lot = 0
+    
+    def abonner(self, rappel, *types_evenement, immediat=False):
+        """
+        Abonne une fonction aux événements du bus
+        
+        Args:
+            rappel (callable): La fonction appelée avec l'événement en argument
+            *types_evenement (type): Les classes d'événements à recevoir (toutes si aucune)
+            immediat (bool, optional): Recevoir les événements pendant publier(),
+                même au cours d'un lot. Defaults to False.
+        """
+        self._abonnes.append((rappel, types_evenement or (Evenement,), immediat))
+    
+    def desabonner(self, rappel):
+        """
+        Désabonne une fonction du bus
+        
+        Args:
+            rappel (callable): La fonction à désabonner
+        
+        Returns:
+            bool: True si la fonction était abonnée, False sinon
+        """
+        for i, (abonne, _, _) in enumerate(self._abonnes):
+            if abonne == rappel:
+                del self._abonnes[i]
+                return True
+        return False
+    
+    def a_des_abonnes(self):
+        """Retourne True si au moins une fonction est abonnée au bus"""
+        return bool(self._abonnes)
+    
+    def publier(self, evenement):
+        """
+        Publie un événement vers les abonnés concernés
+        
+        Args:
+            evenement (Evenement): L'événement à publier
+        """
+        if self._lot is not None:
+            self._livrer(evenement, True)
+            self._lot.append(evenement)
+            return
+        
+        # Copie de la liste : un abonné peut se désabonner pendant la livraison
+        for rappel, types_evenement, _ in tuple(self._abonnes):
+            if isinstance(evenement, types_evenement):
+                rappel(evenement)
+    
+    def _livrer(self, evenement, immediat):
+        """Livre un événement aux seuls abonnés immédiats, ou aux seuls abonnés différés"""
+        for rappel, types_evenement, abonne_immediat in tuple(self._abonnes):
+            if abonne_immediat == immediat and isinstance(evenement, types_evenement):
+                rappel(evenement)
+    
+    def debut_lot(self):
+        """Commence un lot : les événements publiés sont différés jusqu'à fin_lot()"""
+        if self._profondeur_lot == 0:
+            self._lot = []
+        self._profondeur_lot += 1
+    
+    def fin_lot(self):
+        """
+        Termine un lot et livre les événements différés
+        
+        Raises:
+            RuntimeError: Si aucun lot n'est en cours
+        """
+        if self._profondeur_lot == 0:
+            raise RuntimeError("Aucun lot d'événements en cours")
+        
+        self._profondeur_lot -= 1
+        if self._profondeur_lot > 0:
+            return
+        
+        evenements, self._lot = self._lot, None
+        for evenement in evenements:
+            # Les abonnés immédiats l'ont déjà reçu pendant publier()
+            self._livrer(evenement, False)
+    
+    def __enter__(self):
+        self.debut_lot()
+        return self
+    
+    def __exit__(self, type_exc, exc, trace):
+        self.fin_lot()
+        return False
+
+
+class Observable:
+    """
+    Classe de base des objets qui annoncent leurs modifications
+    
+    Le bus n'est créé qu'au premier abonnement : tant que personne n'écoute,
+    _bus vaut None et les méthodes modificatrices ne construisent aucun événement.
+    """
+    
+    # Vide pour que les classes filles puissent se passer de __dict__
+    __slots__ = ()
+    
+    _bus = None
+    
+    def get_bus(self):
+        """
+        Retourne le bus d'événements de l'objet, en le créant si nécessaire
+        
+        Returns:
+            BusEvenements: Le bus d'événements de l'objet
+        """
+        if self._bus is None:
+            self._bus = BusEvenements()
+        return self._bus
+    
+    def abonner(self, rappel, *types_evenement, immediat=False):
+        """
+        Abonne une fonction aux événements de l'objet
+        
+        Args:
+            rappel (callable): La fonction appelée avec l'événement en argument
+            *types_evenement (type): Les classes d'événements à recevoir (toutes si aucune)
+            immediat (bool, optional): Recevoir les événements même au cours
+                d'un lot (voir BusEvenements). Defaults to False.
+        """
+        self.get_bus().abonner(rappel, *types_evenement, immediat=immediat)
+    
+    def desabonner(self, rappel):
+        """
+        Désabonne une fonction des événements de l'objet
+        
+        Args:
+            rappel (callable): La fonction à désabonner
+        
+        Returns:
+            bool: True si la fonction était abonnée, False sinon
+        """
+        if self._bus is None:
+            return False
+        
+        trouve = self._bus.desabonner(rappel)
+        if not self._bus.a_des_abonnes() and self._bus._lot is None:
+            # Revenir au chemin sans coût quand plus personne n'écoute
+            self._bus = None
+        return trouve
\ No newline at end of file
@@ -0,0 +1,452 @@
+import heapq
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from parc_auto import ParcAuto
+from evenement import VehiculeAjoute, VehiculeSupprime, VehiculeModifie, VehiculeLoue, VehiculeRendu
+from format_binaire import parc_vers_octets, InstantaneBinaire
+
+# Répliques des agences tenues par un processus de travail :
+# {identifiant de l'agence: (parc, {id(véhicule): position})}
+_REPLIQUES = {}
+
+
+def _synchroniser(identifiant, octets):
+    """Remplace, dans un processus de travail, la réplique d'une agence"""
+    parc = InstantaneBinaire(octets).vers_parc()
+    positions = {id(vehicule): i for i, vehicule in enumerate(parc.get_vehicules())}
+    _REPLIQUES[identifiant] = (parc, positions)
+
+
+def _appliquer(identifiant, operations):
+    """
+    Applique, dans un processus de travail, les modifications d'une agence à sa réplique
+    
+    Args:
+        identifiant (int): L'identifiant de l'agence
+        operations (list): Des tuples ("ajouter", véhicule), ("supprimer", position)
+            ou ("modifier", position, valeurs retournées par donnees_info())
+    """
+    parc, positions = _REPLIQUES[identifiant]
+    vehicules = parc.get_vehicules()
+    renumeroter = False
+    for operation in operations:
+        if operation[0] == "ajouter":
+            # L'agence a déjà accepté ce véhicule : pas de contrôle de doublon
+            parc.charger_vehicules([operation[1]])
+            positions[id(operation[1])] = len(vehicules) - 1
+        elif operation[0] == "supprimer":
+            parc.supprimer_vehicule(vehicules[operation[1]])
+            renumeroter = True
+        else:
+            vehicule = vehicules[operation[1]]
+            for attribut, valeur, nouvelle_valeur in zip(type(vehicule).ATTRIBUTS_INFO,
+                                                         vehicule.donnees_info(), operation[2]):
+                if valeur != nouvelle_valeur:
+                    getattr(vehicule, "set_" + attribut)(nouvelle_valeur)
+    if renumeroter:
+        _REPLIQUES[identifiant] = (parc, {id(vehicule): i for i, vehicule in enumerate(vehicules)})
+
+
+def _oublier(*identifiants):
+    """Supprime, dans un processus de travail, les répliques d'agences"""
+    for identifiant in identifiants:
+        _REPLIQUES.pop(identifiant, None)
+
+
+def _rechercher_shard(agences, criteres, limite):
+    """
+    Recherche dans les répliques d'un processus de travail
+    
+    Returns:
+        list: Les couples (rang de l'agence, position du véhicule), triés
+    """
+    resultats = []
+    for rang, identifiant in agences:
+        parc, positions = _REPLIQUES[identifiant]
+        requete = parc.requete(**criteres)
+        if limite is not None:
+            requete = requete.limiter(limite)
+        resultats.extend(sorted((rang, positions[id(vehicule)]) for vehicule in requete))
+    return resultats
+
+
+def _compter_shard(agences, criteres):
+    """Compte les véhicules correspondant aux critères dans les répliques d'un processus de travail"""
+    return sum(_REPLIQUES[identifiant][0].requete(**criteres).compter() for _, identifiant in agences)
+
+
+class _JournalAgence:
+    """
+    Modifications d'une agence depuis le dernier envoi à sa réplique
+    
+    Le journal suit les ajouts et suppressions du parc, et les modifications,
+    locations et retours de ses véhicules (voir ParcAuto.abonner_vehicules).
+    """
+    
+    def __init__(self, agence, verrou):
+        """
+        Initialise le journal et commence à suivre l'agence
+        
+        Args:
+            agence (ParcAuto): L'agence suivie
+            verrou (RLock): Le verrou de la fédération, pris à chaque événement
+        """
+        self._agence = agence
+        self._verrou = verrou
+        self._operations = []
+        self._modifies = {}
+        agence.abonner(self._sur_parc, VehiculeAjoute, VehiculeSupprime, immediat=True)
+        agence.abonner_vehicules(self._sur_vehicule, VehiculeModifie, VehiculeLoue, VehiculeRendu, immediat=True)
+    
+    def _sur_parc(self, evenement):
+        with self._verrou:
+            nature = "ajouter" if isinstance(evenement, VehiculeAjoute) else "supprimer"
+            self._operations.append((nature, evenement.vehicule))
+    
+    def _sur_vehicule(self, evenement):
+        with self._verrou:
+            self._modifies[evenement.source] = None
+    
+    def vider(self):
+        """
+        Vide le journal
+        
+        Returns:
+            tuple: Les ajouts et suppressions, dans l'ordre, et les véhicules modifiés
+        """
+        with self._verrou:
+            operations, modifies = self._operations, list(self._modifies)
+            self._operations, self._modifies = [], {}
+        return operations, modifies
+    
+    def fermer(self):
+        """Cesse de suivre l'agence"""
+        self._agence.desabonner(self._sur_parc)
+        self._agence.desabonner_vehicules(self._sur_vehicule)
+
+
+class FederationParcs:
+    """
+    Fédération de plusieurs agences, chacune modélisée par un ParcAuto
+    
+    Les agences sont réparties en shards, un par processus de travail. Chaque
+    processus garde une réplique de ses agences, envoyée entière au format
+    binaire à la première recherche. Ensuite, la fédération suit les
+    événements des agences et n'envoie que leurs modifications : véhicules
+    ajoutés, supprimés, ou dont un attribut ou la disponibilité a changé.
+    Les répliques sont repérées par un identifiant attribué à l'ajout de
+    l'agence, qui ne dépend pas de son nom. Une recherche
+    est lancée en même temps sur tous les shards ; les résultats sont
+    fusionnés dans l'ordre des agences puis des véhicules de chaque agence,
+    et les véhicules retournés sont ceux des agences réelles.
+    
+    Avec un seul processus, les recherches sont faites directement sur les
+    agences, sans réplique.
+    """
+    
+    def __init__(self, nom, nb_processus=None):
+        """
+        Initialise une fédération vide
+        
+        Args:
+            nom (str): Le nom de la fédération
+            nb_processus (int, optional): Le nombre de shards (processus de travail). Defaults to os.cpu_count().
+        """
+        self._nom = nom
+        self._agences = []
+        self._nb_processus = nb_processus or os.cpu_count() or 1
+        self._executeurs = []
+        # Par agence : identifiant de sa réplique, attribué à l'ajout
+        self._identifiants = {}
+        self._prochain_identifiant = 0
+        # Par agence : (véhicules dans l'ordre de la réplique, {id(véhicule): position})
+        self._repliques = {}
+        # Par agence : journal des modifications pas encore envoyées
+        self._journaux = {}
+        self._verrou = threading.RLock()
+    
+    def get_nom(self):
+        """Retourne le nom de la fédération"""
+        return self._nom
+    
+    def get_agences(self):
+        """Retourne la liste des agences de la fédération"""
+        return self._agences
+    
+    def agence(self, nom):
+        """
+        Retourne une agence par son nom
+        
+        Args:
+            nom (str): Le nom de l'agence
+        
+        Returns:
+            ParcAuto: L'agence, ou None si aucune agence ne porte ce nom
+        """
+        for agence in self._agences:
+            if agence.get_nom() == nom:
+                return agence
+        return None
+    
+    def ajouter_agence(self, agence):
+        """
+        Ajoute une agence à la fédération
+        
+        Args:
+            agence (ParcAuto): L'agence à ajouter
+        
+        Returns:
+            bool: True si l'agence a été ajoutée, False si une agence porte déjà ce nom
+        
+        Raises:
+            TypeError: Si l'agence n'est pas une instance de la classe ParcAuto
+        """
+        if not isinstance(agence, ParcAuto):
+            raise TypeError("L'agence doit être une instance de la classe ParcAuto")
+        with self._verrou:
+            if self.agence(agence.get_nom()) is not None:
+                return False
+            self._agences.append(agence)
+            self._identifiants[agence] = self._prochain_identifiant
+            self._prochain_identifiant += 1
+        return True
+    
+    def retirer_agence(self, agence):
+        """
+        Retire une agence de la fédération
+        
+        Args:
+            agence (ParcAuto): L'agence à retirer
+        
+        Returns:
+            bool: True si l'agence a été retirée, False si elle n'était pas dans la fédération
+        """
+        with self._verrou:
+            if agence not in self._agences:
+                return False
+            rang = self._agences.index(agence)
+            if self._executeurs:
+                # L'agence et les suivantes, qui changent de shard, sont oubliées
+                # par leur processus actuel ; les suivantes seront renvoyées
+                oublis = [[] for _ in self._executeurs]
+                for rang_suivant in range(rang, len(self._agences)):
+                    oublis[self._shard(rang_suivant)].append(self._identifiants[self._agences[rang_suivant]])
+                for executeur, identifiants in zip(self._executeurs, oublis):
+                    if identifiants:
+                        executeur.submit(_oublier, *identifiants).result()
+            self._agences.remove(agence)
+            del self._identifiants[agence]
+            journal = self._journaux.pop(agence, None)
+            if journal is not None:
+                journal.fermer()
+            self._repliques = {precedente: self._repliques[precedente]
+                               for precedente in self._agences[:rang] if precedente in self._repliques}
+        return True
+    
+    def _shard(self, rang):
+        return rang % self._nb_processus
+    
+    def _synchroniser(self):
+        """
+        Envoie aux processus de travail les modifications des agences depuis le dernier envoi
+        
+        Une agence est envoyée entière la première fois, quand elle change de
+        shard, ou quand ses modifications sont plus nombreuses que ses véhicules.
+        
+        Returns:
+            list: Pour chaque shard, les couples (rang, identifiant) de ses agences
+        """
+        if not self._executeurs:
+            self._executeurs = [ProcessPoolExecutor(max_workers=1) for _ in range(self._nb_processus)]
+        
+        envois = []
+        shards = [[] for _ in range(self._nb_processus)]
+        for rang, agence in enumerate(self._agences):
+            shard = self._shard(rang)
+            identifiant = self._identifiants[agence]
+            shards[shard].append((rang, identifiant))
+            journal = self._journaux.get(agence)
+            if journal is None:
+                journal = self._journaux[agence] = _JournalAgence(agence, self._verrou)
+            replique = self._repliques.get(agence)
+            operations = None
+            if replique is not None:
+                operations = self._operations_replique(replique, *journal.vider())
+                if len(replique[0]) != len(agence.get_vehicules()):
+                    operations = None
+            if operations is None:
+                journal.vider()
+                vehicules = list(agence.get_vehicules())
+                self._repliques[agence] = (vehicules, {id(vehicule): i for i, vehicule in enumerate(vehicules)})
+                envois.append(self._executeurs[shard].submit(
+                    _synchroniser, identifiant, parc_vers_octets(agence)))
+            elif operations:
+                envois.append(self._executeurs[shard].submit(_appliquer, identifiant, operations))
+        for envoi in envois:
+            envoi.result()
+        return shards
+    
+    def _operations_replique(self, replique, operations, modifies):
+        """
+        Traduit le journal d'une agence en opérations sur sa réplique
+        
+        Les ajouts et suppressions sont aussi appliqués à la liste des
+        véhicules de la réplique tenue par la fédération.
+        
+        Args:
+            replique (tuple): Les véhicules de la réplique et leurs positions
+            operations (list): Les ajouts et suppressions du journal
+            modifies (list): Les véhicules modifiés du journal
+        
+        Returns:
+            list: Les opérations à envoyer (voir _appliquer), ou None si
+                l'agence doit être renvoyée entière
+        """
+        vehicules, positions = replique
+        if len(operations) + len(modifies) > len(vehicules):
+            return None
+        envoi = []
+        for nature, vehicule in operations:
+            # Un événement déjà pris en compte par un envoi complet est ignoré
+            present = id(vehicule) in positions
+            if nature == "ajouter" and not present:
+                positions[id(vehicule)] = len(vehicules)
+                vehicules.append(vehicule)
+                envoi.append(("ajouter", vehicule))
+            elif nature == "supprimer" and present:
+                position = positions[id(vehicule)]
+                del vehicules[position]
+                positions.clear()
+                positions.update((id(suivant), i) for i, suivant in enumerate(vehicules))
+                envoi.append(("supprimer", position))
+        for vehicule in modifies:
+            position = positions.get(id(vehicule))
+            if position is not None:
+                donnees = vehicule.donnees_info()
+                if donnees is None or not hasattr(type(vehicule), "ATTRIBUTS_INFO"):
+                    return None
+                envoi.append(("modifier", position, donnees))
+        return envoi
+    
+    def rechercher_vehicule(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None, limite=None):
+        """
+        Recherche des véhicules dans toutes les agences de la fédération
+        
+        Les critères sont ceux de ParcAuto.rechercher_vehicule().
+        
+        Args:
+            limite (int, optional): Le nombre maximal de résultats. Defaults to None.
+        
+        Returns:
+            list: Les couples (agence, véhicule) correspondant aux critères,
+                dans l'ordre des agences puis des véhicules de chaque agence
+        """
+        criteres = dict(marque=marque, modele=modele, annee=annee,
+                        disponible=disponible, type_vehicule=type_vehicule)
+        with self._verrou:
+            if self._nb_processus == 1:
+                resultats = []
+                for agence in self._agences:
+                    requete = agence.requete(**criteres)
+                    if limite is not None:
+                        requete = requete.limiter(limite - len(resultats))
+                    resultats.extend((agence, vehicule) for vehicule in requete)
+                    if limite is not None and len(resultats) >= limite:
+                        break
+                return resultats
+            
+            shards = self._synchroniser()
+            futurs = [self._executeurs[i].submit(_rechercher_shard, agences, criteres, limite)
+                      for i, agences in enumerate(shards) if agences]
+            fusion = heapq.merge(*(futur.result() for futur in futurs))
+            resultats = []
+            for rang, position in fusion:
+                agence = self._agences[rang]
+                resultats.append((agence, self._repliques[agence][0][position]))
+                if limite is not None and len(resultats) >= limite:
+                    break
+            return resultats
+    
+    def compter_vehicules(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None):
+        """
+        Compte les véhicules de toutes les agences selon différents critères
+        
+        Les critères sont ceux de ParcAuto.rechercher_vehicule().
+        
+        Returns:
+            int: Le nombre de véhicules correspondant aux critères
+        """
+        criteres = dict(marque=marque, modele=modele, annee=annee,
+                        disponible=disponible, type_vehicule=type_vehicule)
+        with self._verrou:
+            if self._nb_processus == 1:
+                return sum(agence.requete(**criteres).compter() for agence in self._agences)
+            
+            shards = self._synchroniser()
+            futurs = [self._executeurs[i].submit(_compter_shard, agences, criteres)
+                      for i, agences in enumerate(shards) if agences]
+            return sum(futur.result() for futur in futurs)
+    
+    def transferer_vehicule(self, vehicule, source, destination):
+        """
+        Transfère un véhicule d'une agence à une autre
+        
+        Le transfert est atomique pour la fédération : aucune recherche ne
+        voit le véhicule dans les deux agences, ni dans aucune.
+        
+        Args:
+            vehicule (Vehicule): Le véhicule à transférer
+            source (ParcAuto): L'agence qui possède le véhicule
+            destination (ParcAuto): L'agence qui reçoit le véhicule
+        
+        Returns:
+            bool: True si le véhicule a été transféré, False si l'agence de
+                destination possède déjà un véhicule similaire
+        
+        Raises:
+            ValueError: Si une agence n'est pas dans la fédération ou si le véhicule n'est pas dans l'agence source
+        """
+        with self._verrou:
+            if source not in self._agences or destination not in self._agences:
+                raise ValueError("Les deux agences doivent faire partie de la fédération")
+            if vehicule not in source:
+                raise ValueError("Le véhicule n'est pas dans l'agence source")
+            if source is destination:
+                return True
+            if not destination.ajouter_vehicule(vehicule):
+                return False
+            source.supprimer_vehicule(vehicule)
+        return True
+    
+    def fermer(self):
+        """Arrête les processus de travail ; ils seront relancés à la prochaine recherche"""
+        with self._verrou:
+            for executeur in self._executeurs:
+                executeur.shutdown()
+            for journal in self._journaux.values():
+                journal.fermer()
+            self._executeurs = []
+            self._repliques = {}
+            self._journaux = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type_exc, exc, trace):
+        self.fermer()
+        return False
+    
+    def afficher(self):
+        """
+        Affiche un résumé de la fédération
+        
+        Returns:
+            str: Une chaîne contenant le nombre de véhicules de chaque agence
+        """
+        info = f"Fédération: {self._nom}\n"
+        info += f"Nombre d'agences: {len(self._agences)}\n"
+        for agence in self._agences:
+            info += f"- {agence.get_nom()}: {len(agence.get_vehicules())} véhicules\n"
+        return info
\ No newline at end of file
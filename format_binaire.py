@@ -0,0 +1,429 @@
+import io
+import mmap
+import struct
+
+from vehicule import Voiture, Camion
+from client import Client
+from date import Date
+from location import Location
+from parc_auto import ParcAuto
+
+# Format d'un instantané binaire de parc automobile (petit-boutiste) :
+#   en-tête, table des chaînes, véhicules, clients, locations
+# Tous les enregistrements ont une taille fixe : l'enregistrement i d'une
+# section se lit directement à l'adresse debut_section + i * taille.
+SIGNATURE = b"APSB"
+VERSION = 2
+
+_EN_TETE = struct.Struct("<4sHxxIIIIQQQQQ")
+# type, disponible, valeur entière (1) ou flottante (0), annee, marque, modele, nb_portes ou capacite
+_VEHICULE = struct.Struct("<BBBxiIId")
+# identifiant, type de l'identifiant, nom
+_CLIENT = struct.Struct("<IBxxxI")
+# identifiant, type de l'identifiant, indice client, indice véhicule, ordinal début, ordinal fin (0 si en cours)
+_LOCATION = struct.Struct("<IBxxxIIii")
+_OFFSET = struct.Struct("<I")
+
+TYPE_VOITURE = 0
+TYPE_CAMION = 1
+
+# Types d'identifiants de clients et de locations, stockés dans la table des chaînes
+ID_CHAINE = 0
+ID_ENTIER = 1
+
+
+def _coder_identifiant(chaines, identifiant):
+    """Retourne (indice dans la table des chaînes, type) d'un identifiant str ou int"""
+    if isinstance(identifiant, str):
+        return chaines.indice(identifiant), ID_CHAINE
+    if isinstance(identifiant, int) and not isinstance(identifiant, bool):
+        return chaines.indice(str(identifiant)), ID_ENTIER
+    raise TypeError("Les identifiants de clients et de locations doivent être des chaînes ou des entiers")
+
+
+class _TableChaines:
+    """Table des chaînes à écrire : chaque chaîne distincte n'est stockée qu'une fois"""
+    
+    def __init__(self):
+        self._indices = {}
+        self._chaines = []
+    
+    def indice(self, chaine):
+        chaine = str(chaine)
+        indice = self._indices.get(chaine)
+        if indice is None:
+            indice = len(self._chaines)
+            self._indices[chaine] = indice
+            self._chaines.append(chaine)
+        return indice
+    
+    def __len__(self):
+        return len(self._chaines)
+    
+    def encoder(self):
+        donnees = [c.encode("utf-8") for c in self._chaines]
+        offsets = bytearray()
+        position = 0
+        for d in donnees:
+            offsets += _OFFSET.pack(position)
+            position += len(d)
+        offsets += _OFFSET.pack(position)
+        return bytes(offsets) + b"".join(donnees)
+
+
+def ecrire_parc(parc, fichier, clients=(), locations=()):
+    """
+    Écrit un instantané binaire du parc automobile dans un fichier ouvert en écriture binaire
+    
+    Les identifiants de clients et de locations doivent être des chaînes ou
+    des entiers ; leur type est conservé.
+    
+    Args:
+        parc (ParcAuto): Le parc automobile à sauvegarder
+        fichier (file): Le fichier de destination
+        clients (list, optional): Les clients à sauvegarder. Defaults to ().
+        locations (list, optional): Les locations à sauvegarder. Defaults to ().
+    
+    Raises:
+        TypeError: Si un véhicule n'est ni une Voiture ni un Camion, ou si un identifiant
+            n'est ni une chaîne ni un entier
+        ValueError: Si une location référence un véhicule ou un client absent de l'instantané
+    """
+    chaines = _TableChaines()
+    chaines.indice(parc.get_nom())
+    
+    vehicules = parc.get_vehicules()
+    indices_vehicules = {}
+    section_vehicules = bytearray(_VEHICULE.size * len(vehicules))
+    for i, vehicule in enumerate(vehicules):
+        if isinstance(vehicule, Voiture):
+            type_vehicule, valeur = TYPE_VOITURE, vehicule.get_nb_portes()
+        elif isinstance(vehicule, Camion):
+            type_vehicule, valeur = TYPE_CAMION, vehicule.get_capacite()
+        else:
+            raise TypeError("Le véhicule doit être une instance de Voiture ou de Camion")
+        _VEHICULE.pack_into(section_vehicules, i * _VEHICULE.size,
+                            type_vehicule, vehicule.est_disponible(),
+                            isinstance(valeur, int) and not isinstance(valeur, bool), vehicule.get_annee(),
+                            chaines.indice(vehicule.get_marque()),
+                            chaines.indice(vehicule.get_modele()), valeur)
+        indices_vehicules[id(vehicule)] = i
+    
+    indices_clients = {}
+    section_clients = bytearray(_CLIENT.size * len(clients))
+    for i, client in enumerate(clients):
+        _CLIENT.pack_into(section_clients, i * _CLIENT.size,
+                          *_coder_identifiant(chaines, client.get_id_client()), chaines.indice(client.get_nom()))
+        indices_clients[id(client)] = i
+    
+    section_locations = bytearray(_LOCATION.size * len(locations))
+    for i, location in enumerate(locations):
+        indice_vehicule = indices_vehicules.get(id(location.get_vehicule()))
+        indice_client = indices_clients.get(id(location.get_client()))
+        if indice_vehicule is None or indice_client is None:
+            raise ValueError("La location référence un véhicule ou un client absent de l'instantané")
+        date_fin = location.get_date_fin()
+        _LOCATION.pack_into(section_locations, i * _LOCATION.size,
+                            *_coder_identifiant(chaines, location.get_id_location()), indice_client, indice_vehicule,
+                            location.get_date_debut().vers_ordinal(),
+                            0 if date_fin is None else date_fin.vers_ordinal())
+    
+    section_chaines = chaines.encoder()
+    debut_chaines = _EN_TETE.size
+    debut_vehicules = debut_chaines + len(section_chaines)
+    debut_clients = debut_vehicules + len(section_vehicules)
+    debut_locations = debut_clients + len(section_clients)
+    fin = debut_locations + len(section_locations)
+    
+    fichier.write(_EN_TETE.pack(SIGNATURE, VERSION, len(chaines), len(vehicules),
+                                len(clients), len(locations), debut_chaines, debut_vehicules,
+                                debut_clients, debut_locations, fin))
+    fichier.write(section_chaines)
+    fichier.write(section_vehicules)
+    fichier.write(section_clients)
+    fichier.write(section_locations)
+
+
+def sauvegarder_parc(chemin, parc, clients=(), locations=()):
+    """
+    Sauvegarde un instantané binaire du parc automobile dans un fichier
+    
+    Args:
+        chemin (str): Le chemin du fichier à créer
+        parc (ParcAuto): Le parc automobile à sauvegarder
+        clients (list, optional): Les clients à sauvegarder. Defaults to ().
+        locations (list, optional): Les locations à sauvegarder. Defaults to ().
+    """
+    with open(chemin, "wb") as fichier:
+        ecrire_parc(parc, fichier, clients, locations)
+
+
+def parc_vers_octets(parc, clients=(), locations=()):
+    """
+    Retourne l'instantané binaire du parc automobile sous forme d'octets
+    
+    Args:
+        parc (ParcAuto): Le parc automobile à sauvegarder
+        clients (list, optional): Les clients à sauvegarder. Defaults to ().
+        locations (list, optional): Les locations à sauvegarder. Defaults to ().
+    
+    Returns:
+        bytes: L'instantané binaire
+    """
+    tampon = io.BytesIO()
+    ecrire_parc(parc, tampon, clients, locations)
+    return tampon.getvalue()
+
+
+class InstantaneBinaire:
+    """
+    Accès en lecture seule à un instantané binaire de parc automobile
+    
+    Les enregistrements sont lus directement dans le tampon (sans copie) ;
+    les objets Vehicule, Client et Location ne sont construits qu'au premier
+    accès, puis conservés pour que deux accès retournent le même objet.
+    """
+    
+    def __init__(self, tampon):
+        """
+        Initialise l'accès à un instantané à partir d'un tampon d'octets
+        
+        Args:
+            tampon (bytes | mmap.mmap): Le contenu de l'instantané
+        
+        Raises:
+            ValueError: Si le tampon n'est pas un instantané valide
+        """
+        self._fichier = None
+        self._mmap = None
+        self._donnees = memoryview(tampon)
+        
+        if len(self._donnees) < _EN_TETE.size:
+            raise ValueError("Instantané binaire tronqué")
+        (signature, version, self._nb_chaines, self._nb_vehicules, self._nb_clients,
+         self._nb_locations, self._debut_chaines, self._debut_vehicules,
+         self._debut_clients, self._debut_locations, fin) = _EN_TETE.unpack_from(self._donnees, 0)
+        if signature != SIGNATURE:
+            raise ValueError("Le fichier n'est pas un instantané de parc automobile")
+        if version != VERSION:
+            raise ValueError(f"Version d'instantané non prise en charge: {version}")
+        if len(self._donnees) < fin:
+            raise ValueError("Instantané binaire tronqué")
+        
+        self._debut_texte = self._debut_chaines + _OFFSET.size * (self._nb_chaines + 1)
+        self._chaines = {}
+        self._vehicules = {}
+        self._clients = {}
+        self._locations = {}
+    
+    @classmethod
+    def ouvrir(cls, chemin):
+        """
+        Ouvre un fichier d'instantané en le projetant en mémoire (mmap)
+        
+        Seul l'en-tête est lu à l'ouverture : le coût ne dépend pas de la taille du parc.
+        
+        Args:
+            chemin (str): Le chemin du fichier
+        
+        Returns:
+            InstantaneBinaire: L'instantané ouvert
+        """
+        fichier = open(chemin, "rb")
+        try:
+            projection = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            fichier.close()
+            raise
+        instantane = cls(projection)
+        instantane._fichier = fichier
+        instantane._mmap = projection
+        return instantane
+    
+    def fermer(self):
+        """Libère la projection mémoire et le fichier sous-jacents"""
+        self._donnees.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type_exc, exc, trace):
+        self.fermer()
+        return False
+    
+    def chaine(self, indice):
+        """
+        Retourne une chaîne de la table des chaînes
+        
+        Args:
+            indice (int): L'indice de la chaîne
+        
+        Returns:
+            str: La chaîne décodée
+        """
+        chaine = self._chaines.get(indice)
+        if chaine is None:
+            debut, = _OFFSET.unpack_from(self._donnees, self._debut_chaines + indice * _OFFSET.size)
+            fin, = _OFFSET.unpack_from(self._donnees, self._debut_chaines + (indice + 1) * _OFFSET.size)
+            chaine = str(self._donnees[self._debut_texte + debut:self._debut_texte + fin], "utf-8")
+            self._chaines[indice] = chaine
+        return chaine
+    
+    def get_nom(self):
+        """Retourne le nom du parc automobile sauvegardé"""
+        return self.chaine(0)
+    
+    # Véhicules
+    def nb_vehicules(self):
+        """Retourne le nombre de véhicules de l'instantané"""
+        return self._nb_vehicules
+    
+    def enregistrement_vehicule(self, indice):
+        """
+        Lit l'enregistrement brut d'un véhicule sans construire d'objet
+        
+        Args:
+            indice (int): L'indice du véhicule
+        
+        Returns:
+            tuple: (type, disponible, valeur entière, annee, indice marque, indice modele, nb_portes ou capacite)
+        
+        Raises:
+            IndexError: Si l'indice est hors de l'instantané
+        """
+        if not 0 <= indice < self._nb_vehicules:
+            raise IndexError("Indice de véhicule hors de l'instantané")
+        return _VEHICULE.unpack_from(self._donnees, self._debut_vehicules + indice * _VEHICULE.size)
+    
+    def vehicule(self, indice):
+        """
+        Retourne le véhicule d'indice donné, construit au premier accès
+        
+        Args:
+            indice (int): L'indice du véhicule
+        
+        Returns:
+            Vehicule: Le véhicule
+        """
+        vehicule = self._vehicules.get(indice)
+        if vehicule is None:
+            type_vehicule, disponible, entier, annee, marque, modele, valeur = self.enregistrement_vehicule(indice)
+            if entier:
+                valeur = int(valeur)
+            if type_vehicule == TYPE_VOITURE:
+                vehicule = Voiture(self.chaine(marque), self.chaine(modele), annee, valeur)
+            else:
+                vehicule = Camion(self.chaine(marque), self.chaine(modele), annee, valeur)
+            vehicule.set_disponible(bool(disponible))
+            self._vehicules[indice] = vehicule
+        return vehicule
+    
+    def iter_vehicules(self):
+        """Itère sur les véhicules de l'instantané en les construisant à la demande"""
+        for indice in range(self._nb_vehicules):
+            yield self.vehicule(indice)
+    
+    def _identifiant(self, indice, type_identifiant):
+        """Décode un identifiant de client ou de location"""
+        chaine = self.chaine(indice)
+        return int(chaine) if type_identifiant == ID_ENTIER else chaine
+    
+    # Clients
+    def nb_clients(self):
+        """Retourne le nombre de clients de l'instantané"""
+        return self._nb_clients
+    
+    def client(self, indice):
+        """
+        Retourne le client d'indice donné, construit au premier accès
+        
+        Args:
+            indice (int): L'indice du client
+        
+        Returns:
+            Client: Le client
+        
+        Raises:
+            IndexError: Si l'indice est hors de l'instantané
+        """
+        client = self._clients.get(indice)
+        if client is None:
+            if not 0 <= indice < self._nb_clients:
+                raise IndexError("Indice de client hors de l'instantané")
+            id_client, type_id, nom = _CLIENT.unpack_from(self._donnees, self._debut_clients + indice * _CLIENT.size)
+            client = Client(self._identifiant(id_client, type_id), self.chaine(nom))
+            self._clients[indice] = client
+        return client
+    
+    def iter_clients(self):
+        """Itère sur les clients de l'instantané en les construisant à la demande"""
+        for indice in range(self._nb_clients):
+            yield self.client(indice)
+    
+    # Locations
+    def nb_locations(self):
+        """Retourne le nombre de locations de l'instantané"""
+        return self._nb_locations
+    
+    def location(self, indice):
+        """
+        Retourne la location d'indice donné, construite au premier accès
+        
+        Le véhicule et le client de la location sont partagés avec ceux
+        retournés par vehicule() et client().
+        
+        Args:
+            indice (int): L'indice de la location
+        
+        Returns:
+            Location: La location
+        
+        Raises:
+            IndexError: Si l'indice est hors de l'instantané
+        """
+        location = self._locations.get(indice)
+        if location is None:
+            if not 0 <= indice < self._nb_locations:
+                raise IndexError("Indice de location hors de l'instantané")
+            id_location, type_id, client, vehicule, debut, fin = _LOCATION.unpack_from(
+                self._donnees, self._debut_locations + indice * _LOCATION.size)
+            location = Location._restaurer(self._identifiant(id_location, type_id), self.client(client),
+                                           self.vehicule(vehicule), Date.depuis_ordinal(debut),
+                                           Date.depuis_ordinal(fin) if fin else None)
+            self._locations[indice] = location
+        return location
+    
+    def iter_locations(self):
+        """Itère sur les locations de l'instantané en les construisant à la demande"""
+        for indice in range(self._nb_locations):
+            yield self.location(indice)
+    
+    def vers_parc(self):
+        """
+        Construit un ParcAuto complet à partir de l'instantané
+        
+        Returns:
+            ParcAuto: Le parc automobile contenant tous les véhicules
+        """
+        parc = ParcAuto(self.get_nom())
+        parc.charger_vehicules(self.iter_vehicules())
+        return parc
+
+
+def ouvrir_parc(chemin):
+    """
+    Ouvre un instantané binaire de parc automobile par projection mémoire
+    
+    Args:
+        chemin (str): Le chemin du fichier
+    
+    Returns:
+        InstantaneBinaire: L'instantané ouvert en lecture seule
+    """
+    return InstantaneBinaire.ouvrir(chemin)
\ No newline at end of file
@@ -0,0 +1,233 @@
+from vehicule import Voiture, Camion
+from planificateur import normaliser_criteres
+from rendu import formater_parc
+
+
+class VueVehicule:
+    """
+    Vue en lecture seule d'un véhicule tel qu'il était lors d'un instantané
+    
+    Chaque lecture consulte l'instantané : les valeurs modifiées depuis
+    l'instantané, même après la création de la vue, sont lues dans les
+    anciennes valeurs qu'il conserve, les autres directement sur le véhicule.
+    """
+    
+    def __init__(self, vehicule, instantane):
+        """
+        Initialise une vue
+        
+        Args:
+            vehicule (Vehicule): Le véhicule réel
+            instantane (InstantaneParc): L'instantané qui conserve les anciennes valeurs
+        """
+        self._vehicule = vehicule
+        self._instantane = instantane
+    
+    def _valeur(self, attribut, valeur_courante):
+        anciennes = self._instantane._anciennes_valeurs_de(self._vehicule)
+        return anciennes.get(attribut, valeur_courante) if anciennes else valeur_courante
+    
+    def get_vehicule(self):
+        """Retourne le véhicule réel (dans son état courant)"""
+        return self._vehicule
+    
+    def get_marque(self):
+        """Retourne la marque du véhicule lors de l'instantané"""
+        return self._valeur("marque", self._vehicule.get_marque())
+    
+    def get_modele(self):
+        """Retourne le modèle du véhicule lors de l'instantané"""
+        return self._valeur("modele", self._vehicule.get_modele())
+    
+    def get_annee(self):
+        """Retourne l'année du véhicule lors de l'instantané"""
+        return self._valeur("annee", self._vehicule.get_annee())
+    
+    def est_disponible(self):
+        """Retourne la disponibilité du véhicule lors de l'instantané"""
+        return self._valeur("disponible", self._vehicule.est_disponible())
+    
+    def get_nb_portes(self):
+        """Retourne le nombre de portes de la voiture lors de l'instantané"""
+        return self._valeur("nb_portes", self._vehicule.get_nb_portes())
+    
+    def get_capacite(self):
+        """Retourne la capacité du camion lors de l'instantané"""
+        return self._valeur("capacite", self._vehicule.get_capacite())
+    
+    def afficher_info(self):
+        """
+        Affiche les informations du véhicule lors de l'instantané
+        
+        Returns:
+            str: La chaîne qu'afficher_info() retournait lors de l'instantané
+        """
+        classe = type(self._vehicule)
+        if not self._instantane._anciennes_valeurs_de(self._vehicule) or not hasattr(classe, "ATTRIBUTS_INFO"):
+            # Véhicule inchangé (ou classe sans donnees_info) : la chaîne du véhicule réel
+            return self._vehicule.afficher_info()
+        donnees = [self._valeur(attribut, valeur)
+                   for attribut, valeur in zip(classe.ATTRIBUTS_INFO, self._vehicule.donnees_info())]
+        return classe.formater_info(*donnees)
+
+
+class InstantaneParc:
+    """
+    Instantané en lecture seule d'un parc automobile (copie sur écriture)
+    
+    La création ne copie rien. La liste des véhicules n'est copiée qu'à la
+    première modification structurelle du parc (ajout ou suppression), et
+    seule l'ancienne valeur de chaque attribut modifié ensuite est conservée :
+    le coût d'un instantané suit le nombre de modifications faites après lui.
+    
+    Les lectures peuvent se faire depuis d'autres threads que les écritures.
+    Tant que la liste est partagée avec le parc, une lecture la copie sous le
+    verrou du parc (le temps de la copie) et ne parcourt jamais la liste que
+    le parc modifie. Limite : un attribut est modifié sur le véhicule avant
+    que le parc n'en conserve l'ancienne valeur ; une lecture faite pendant
+    l'appel qui le modifie (louer(), set_marque()...) peut donc voir la
+    nouvelle valeur. Une fois l'appel terminé, l'instantané est exact.
+    
+    Un instantané libéré (voir liberer()) ne peut plus être lu.
+    """
+    
+    def __init__(self, parc, vehicules, version):
+        """
+        Initialise un instantané ; utiliser ParcAuto.instantane()
+        
+        Args:
+            parc (ParcAuto): Le parc observé
+            vehicules (list): La liste des véhicules du parc, partagée jusqu'à sa première modification
+            version (int): La version du parc lors de l'instantané
+        """
+        self._parc = parc
+        self._nom = parc.get_nom()
+        self._vehicules = vehicules
+        self._liste_copiee = False
+        self._version = version
+        self._anciennes_valeurs = {}
+        self._libere = False
+    
+    def _copier_liste(self):
+        """Appelé par le parc, sous son verrou, juste avant une modification structurelle"""
+        if not self._liste_copiee:
+            self._vehicules = list(self._vehicules)
+            self._liste_copiee = True
+    
+    def _noter_ancienne_valeur(self, vehicule, attribut, ancienne_valeur):
+        """Appelé par le parc quand un attribut d'un véhicule change ; seule la première valeur compte"""
+        anciennes = self._anciennes_valeurs.get(vehicule)
+        if anciennes is None:
+            anciennes = self._anciennes_valeurs[vehicule] = {}
+        anciennes.setdefault(attribut, ancienne_valeur)
+    
+    def _figer_vehicule(self, vehicule):
+        """Appelé par le parc avant de cesser de suivre un véhicule : conserve toutes ses valeurs"""
+        for attribut, valeur in zip(getattr(type(vehicule), "ATTRIBUTS_INFO", ()), vehicule.donnees_info() or ()):
+            self._noter_ancienne_valeur(vehicule, attribut, valeur)
+    
+    def get_nom(self):
+        """Retourne le nom du parc lors de l'instantané"""
+        return self._nom
+    
+    def get_version(self):
+        """Retourne la version du parc lors de l'instantané"""
+        return self._version
+    
+    def nb_modifications_conservees(self):
+        """Retourne le nombre de véhicules dont l'instantané conserve d'anciennes valeurs"""
+        return len(self._anciennes_valeurs)
+    
+    def _verifier_actif(self):
+        if self._libere:
+            raise ValueError("L'instantané a été libéré : il ne peut plus être lu")
+    
+    def _anciennes_valeurs_de(self, vehicule):
+        """Retourne les anciennes valeurs conservées pour un véhicule, ou None"""
+        self._verifier_actif()
+        return self._anciennes_valeurs.get(vehicule)
+    
+    def _liste_vehicules(self):
+        """Retourne une liste des véhicules de l'instantané que le parc ne modifiera pas"""
+        self._verifier_actif()
+        if self._liste_copiee:
+            return self._vehicules
+        # Liste encore partagée : le parc ne la modifie que sous son verrou, après l'avoir copiée pour nous
+        with self._parc._verrou:
+            return list(self._vehicules)
+    
+    def get_vehicules(self):
+        """
+        Retourne les véhicules du parc tels qu'ils étaient lors de l'instantané
+        
+        Returns:
+            list: Des VueVehicule, dans l'ordre du parc
+        """
+        return [VueVehicule(vehicule, self) for vehicule in self._liste_vehicules()]
+    
+    def rechercher_vehicule(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None):
+        """
+        Recherche des véhicules dans l'état de l'instantané
+        
+        Les arguments sont ceux de ParcAuto.rechercher_vehicule().
+        
+        Returns:
+            list: Les VueVehicule correspondant aux critères
+        """
+        criteres = normaliser_criteres(marque, modele, annee, disponible, type_vehicule)
+        return [vue for vue in self.get_vehicules() if all(self._verifier(vue, c) for c in criteres)]
+    
+    def _verifier(self, vue, critere):
+        attribut, cle = critere
+        if attribut == "marque":
+            return vue.get_marque().lower() == cle
+        if attribut == "modele":
+            return vue.get_modele().lower() == cle
+        if attribut == "annee":
+            return vue.get_annee() == cle
+        if attribut == "disponible":
+            return vue.est_disponible() == cle
+        if cle == "voiture":
+            return isinstance(vue.get_vehicule(), Voiture)
+        return isinstance(vue.get_vehicule(), Camion)
+    
+    def compter_vehicules(self, disponible=None, type_vehicule=None):
+        """
+        Compte les véhicules de l'instantané selon différents critères
+        
+        Returns:
+            int: Le nombre de véhicules correspondant aux critères
+        """
+        return len(self.rechercher_vehicule(disponible=disponible, type_vehicule=type_vehicule))
+    
+    def afficher_parc(self):
+        """
+        Affiche le parc tel qu'il était lors de l'instantané, au format de ParcAuto.afficher_parc()
+        
+        Returns:
+            str: Une chaîne contenant les informations du parc automobile
+        """
+        vues = self.get_vehicules()
+        nb_voitures = sum(1 for vue in vues if isinstance(vue.get_vehicule(), Voiture))
+        nb_camions = sum(1 for vue in vues if isinstance(vue.get_vehicule(), Camion))
+        nb_disponibles = sum(1 for vue in vues if vue.est_disponible())
+        listing = "".join(f"{i}. {vue.afficher_info()}\n" for i, vue in enumerate(vues, 1))
+        return formater_parc(self._nom, len(vues), nb_voitures, nb_camions,
+                             nb_disponibles, len(vues) - nb_disponibles, listing)
+    
+    def liberer(self):
+        """
+        Détache l'instantané du parc : il cesse de conserver les anciennes valeurs
+        
+        Ensuite, toute lecture de l'instantané ou de ses vues lève une ValueError.
+        """
+        if not self._libere:
+            self._parc._liberer_instantane(self)
+            self._libere = True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, type_exc, exc, trace):
+        self.liberer()
+        return False
\ No newline at end of file
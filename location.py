@@ -1,8 +1,11 @@
+import gc
+
 from date import Date
 from client import Client
 from vehicule import Vehicule
+from evenement import Observable, LocationModifiee, LocationTerminee
 
-class Location:
+class Location(Observable):
     """Classe représentant une location de véhicule"""
     
     def __init__(self, id_location, client, vehicule, date_debut, date_fin=None):
@@ -34,15 +37,108 @@ class Location:
         if not vehicule.est_disponible():
             raise ValueError("Le véhicule n'est pas disponible pour la location")
         
+        self._initialiser(id_location, client, vehicule, date_debut, date_fin)
+        
+        # Marquer le véhicule comme loué
+        vehicule.louer()
+    
+    def _initialiser(self, id_location, client, vehicule, date_debut, date_fin):
+        """Initialise les attributs de la location, sans contrôle ; commun à toutes les constructions"""
         self._id_location = id_location
         self._client = client
         self._vehicule = vehicule
         self._date_debut = date_debut
         self._date_fin = date_fin
         self._prix = None
+        self._duree = None
+        self._etat_cache = None  # État dont la durée et le prix en cache ont été calculés
+    
+    @classmethod
+    def _restaurer(cls, id_location, client, vehicule, date_debut, date_fin):
+        """
+        Reconstruit une location sauvegardée sans contrôle ni effet sur le véhicule
         
-        # Marquer le véhicule comme loué
-        vehicule.louer()
+        La disponibilité du véhicule a été sauvegardée avec lui : la location
+        ne doit donc pas appeler louer() une seconde fois.
+        
+        Args:
+            id_location (str): L'identifiant de la location
+            client (Client): Le client de la location
+            vehicule (Vehicule): Le véhicule loué
+            date_debut (Date): La date de début de la location
+            date_fin (Date): La date de fin de la location, ou None
+        
+        Returns:
+            Location: La location reconstruite
+        """
+        location = cls.__new__(cls)
+        location._initialiser(id_location, client, vehicule, date_debut, date_fin)
+        return location
+    
+    @classmethod
+    def importer_historique(cls, enregistrements, verifier_dates=True, suspendre_gc=False):
+        """
+        Construit en bloc des locations terminées, par exemple pour rejouer un historique
+        
+        Les types sont vérifiés une fois par classe rencontrée dans le lot, et
+        non pour chaque location. Les locations étant terminées, la
+        disponibilité des véhicules n'est ni vérifiée ni modifiée : un même
+        véhicule peut apparaître dans autant de locations que nécessaire.
+        Aucune location n'est créée si le lot est invalide.
+        
+        Args:
+            enregistrements (iterable): Des tuples (id_location, client, vehicule, date_debut, date_fin)
+            verifier_dates (bool, optional): Vérifier que chaque date de fin ne précède pas
+                sa date de début. Defaults to True.
+            suspendre_gc (bool, optional): Suspendre le ramasse-miettes pendant la
+                construction, qui s'en trouve nettement accélérée. Le ramasse-miettes
+                est global : il est aussi suspendu pour les autres threads. Defaults to False.
+        
+        Returns:
+            list: Les locations construites, dans l'ordre des enregistrements
+        
+        Raises:
+            TypeError: Si les types des éléments ne sont pas corrects
+            ValueError: Si une location n'a pas de date de fin, ou si une date de fin précède la date de début
+        """
+        enregistrements = list(enregistrements)
+        
+        # Vérification des types : une fois par classe présente dans chaque colonne
+        for position, classe, message in ((1, Client, "Le client doit être une instance de la classe Client"),
+                                          (2, Vehicule, "Le véhicule doit être une instance de la classe Vehicule"),
+                                          (3, Date, "La date de début doit être une instance de la classe Date")):
+            if not all(issubclass(t, classe) for t in {type(e[position]) for e in enregistrements}):
+                raise TypeError(message)
+        types_fin = {type(e[4]) for e in enregistrements}
+        if type(None) in types_fin:
+            raise ValueError("Une location historique doit avoir une date de fin")
+        if not all(issubclass(t, Date) for t in types_fin):
+            raise TypeError("La date de fin doit être une instance de la classe Date")
+        
+        if verifier_dates:
+            for e in enregistrements:
+                debut, fin = e[3], e[4]
+                if ((fin.get_annee(), fin.get_mois(), fin.get_jour()) <
+                        (debut.get_annee(), debut.get_mois(), debut.get_jour())):
+                    raise ValueError(f"La date de fin de la location {e[0]} est antérieure à sa date de début")
+        
+        # Construction sans __init__ (ni contrôle, ni location du véhicule)
+        nouveau = cls.__new__
+        initialiser = cls._initialiser
+        locations = []
+        ajouter = locations.append
+        gc_suspendu = suspendre_gc and gc.isenabled()
+        if gc_suspendu:
+            gc.disable()
+        try:
+            for id_location, client, vehicule, date_debut, date_fin in enregistrements:
+                location = nouveau(cls)
+                initialiser(location, id_location, client, vehicule, date_debut, date_fin)
+                ajouter(location)
+        finally:
+            if gc_suspendu:
+                gc.enable()
+        return locations
     
     # Getters et setters pour id_location
     def get_id_location(self):
@@ -75,7 +171,10 @@ class Location:
         """
         if not isinstance(client, Client):
             raise TypeError("Le client doit être une instance de la classe Client")
+        ancien_client = self._client
         self._client = client
+        if self._bus is not None:
+            self._bus.publier(LocationModifiee(self, "client", ancien_client, client))
     
     # Getters et setters pour vehicule
     def get_vehicule(self):
@@ -100,11 +199,15 @@ class Location:
             raise ValueError("Le véhicule n'est pas disponible pour la location")
         
         # Rendre l'ancien véhicule disponible
-        self._vehicule.rendre()
+        ancien_vehicule = self._vehicule
+        ancien_vehicule.rendre()
         
         # Mettre à jour le véhicule et le marquer comme loué
         self._vehicule = vehicule
         vehicule.louer()
+        self._etat_cache = None  # Le tarif a pu changer
+        if self._bus is not None:
+            self._bus.publier(LocationModifiee(self, "vehicule", ancien_vehicule, vehicule))
     
     # Getters et setters pour date_debut
     def get_date_debut(self):
@@ -128,8 +231,11 @@ class Location:
         if self._date_fin is not None and date_debut.difference(self._date_fin) < 0:
             raise ValueError("La date de début ne peut pas être postérieure à la date de fin")
         
+        ancienne_date = self._date_debut
         self._date_debut = date_debut
-        self._prix = None  # Réinitialiser le prix car la durée a changé
+        self._etat_cache = None  # Réinitialiser la durée et le prix car la durée a changé
+        if self._bus is not None:
+            self._bus.publier(LocationModifiee(self, "date_debut", ancienne_date, date_debut))
     
     # Getters et setters pour date_fin
     def get_date_fin(self):
@@ -154,20 +260,44 @@ class Location:
             if self._date_debut.difference(date_fin) < 0:
                 raise ValueError("La date de fin ne peut pas être antérieure à la date de début")
         
+        ancienne_date = self._date_fin
         self._date_fin = date_fin
-        self._prix = None  # Réinitialiser le prix car la durée a changé
+        self._etat_cache = None  # Réinitialiser la durée et le prix car la durée a changé
+        if self._bus is not None:
+            self._bus.publier(LocationModifiee(self, "date_fin", ancienne_date, date_fin))
+    
+    def _valider_cache(self):
+        """
+        Oublie la durée et le prix en cache si ce dont ils dépendent a changé
+        
+        La durée dépend des dates, qui peuvent être modifiées sans passer par
+        la location : leur numéro de version est donc comparé à celui du
+        calcul. Le prix dépend en plus du véhicule et de sa clé de tarif.
+        """
+        fin = self._date_fin
+        etat = (self._date_debut, self._date_debut.get_version(), fin, fin.get_version(),
+                self._vehicule, self._vehicule.cle_tarif())
+        if etat != self._etat_cache:
+            self._etat_cache = etat
+            self._duree = None
+            self._prix = None
     
     def duree(self):
         """
         Calcule la durée de la location en jours
         
+        La durée est gardée en cache jusqu'à la modification d'une des dates.
+        
         Returns:
             int: Le nombre de jours de la location, ou None si la date de fin n'est pas définie
         """
         if self._date_fin is None:
             return None
         
-        return self._date_debut.difference(self._date_fin)
+        self._valider_cache()
+        if self._duree is None:
+            self._duree = self._date_debut.difference(self._date_fin)
+        return self._duree
     
     def terminer(self, date_fin):
         """
@@ -188,20 +318,29 @@ class Location:
         # Rendre le véhicule disponible
         self._vehicule.rendre()
         
-        # Calculer et retourner le prix
-        return self.calcul_prix()
+        # Calculer le prix avant d'annoncer la fin pour que les abonnés le voient
+        prix = self.calcul_prix()
+        if self._bus is not None:
+            self._bus.publier(LocationTerminee(self, date_fin))
+        
+        return prix
     
     def calcul_prix(self):
         """
         Calcule le prix de la location
         
+        Le prix est gardé en cache jusqu'à la modification des dates, du
+        véhicule de la location ou d'un attribut de tarif de ce véhicule.
+        
         Returns:
             float: Le prix de la location, ou None si la date de fin n'est pas définie
         """
         if self._date_fin is None:
             return None
         
-        nb_jours = self.duree()
+        nb_jours = self.duree()  # Valide aussi le prix en cache
+        if self._prix is not None:
+            return self._prix
         
         if nb_jours == 0:
             nb_jours = 1  # Minimum 1 jour de location
@@ -217,11 +356,8 @@ class Location:
         Returns:
             float: Le prix de la location, ou None s'il n'a pas encore été calculé
         """
-        # Si le prix n'a pas encore été calculé, le calculer
-        if self._prix is None and self._date_fin is not None:
-            self._prix = self.calcul_prix()
-        
-        return self._prix
+        # Calculé au premier appel, puis lu dans le cache tant qu'il reste valide
+        return self.calcul_prix()
     
     def afficher(self):
         """
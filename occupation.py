@@ -0,0 +1,343 @@
+from datetime import date as _date_iso
+
+from date import Date
+from vehicule import Voiture, Camion
+from evenement import LocationModifiee
+
+
+def _compter_bits(valeur):
+    """Retourne le nombre de bits à 1 d'un entier positif"""
+    return bin(valeur).count("1")
+
+
+if hasattr(int, "bit_count"):
+    # Python 3.10+ : popcount natif
+    _compter_bits = int.bit_count
+
+
+def _plus_longue_suite(valeur):
+    """Retourne la longueur de la plus longue suite de bits à 1 consécutifs"""
+    longueur = 0
+    while valeur:
+        valeur &= valeur >> 1
+        longueur += 1
+    return longueur
+
+
+def _premier_jour(annee):
+    return Date(1, 1, annee).vers_ordinal()
+
+
+def _periode(annee, mois=None):
+    """Retourne (masque des jours de la période, nombre de jours) pour une année ou un mois"""
+    debut_annee = _premier_jour(annee)
+    if mois is None:
+        nb_jours = _premier_jour(annee + 1) - debut_annee
+        return (1 << nb_jours) - 1, nb_jours
+    
+    debut = Date(1, mois, annee).vers_ordinal() - debut_annee
+    if mois == 12:
+        fin = _premier_jour(annee + 1) - debut_annee
+    else:
+        fin = Date(1, mois + 1, annee).vers_ordinal() - debut_annee
+    return ((1 << (fin - debut)) - 1) << debut, fin - debut
+
+
+class RegistreOccupation:
+    """
+    Registre des jours de location de chaque véhicule, sous forme de bitsets
+    
+    Chaque véhicule possède, pour chaque année, un entier dont le bit i vaut 1
+    si le véhicule est loué le i-ème jour de l'année (0 pour le 1er janvier).
+    Une location occupe les jours de date_debut inclus à date_fin exclue, et
+    au moins un jour, comme pour le calcul du prix. Une location en cours
+    occupe son véhicule de son début jusqu'au jour de référence inclus (voir
+    set_jusqu_au), par défaut le jour courant. Les locations enregistrées sont
+    suivies : un changement de dates, de véhicule ou leur fin met le registre
+    à jour. Une date modifiée sur place (Date.set_jour...) est détectée à la
+    requête suivante ; tant qu'aucune date n'a changé, les requêtes ne
+    parcourent pas les locations.
+    """
+    
+    def __init__(self, jusqu_au=None):
+        """
+        Initialise un registre vide
+        
+        Args:
+            jusqu_au (Date, optional): Le dernier jour occupé par les locations en cours.
+                Defaults to None : le jour courant.
+        """
+        self._bits = {}
+        self._locations = {}
+        self._intervalles = {}
+        self._etats = {}  # Par location : dates et versions lors du calcul de l'intervalle
+        self._en_cours = set()
+        self._jusqu_au = jusqu_au
+        self._jour_reference = self._calculer_jour_reference()
+        self._nb_modifications_dates = Date.nb_modifications()
+    
+    def get_jusqu_au(self):
+        """Retourne le dernier jour occupé par les locations en cours, ou None pour le jour courant"""
+        return self._jusqu_au
+    
+    def set_jusqu_au(self, jusqu_au):
+        """
+        Modifie le dernier jour occupé par les locations en cours
+        
+        Args:
+            jusqu_au (Date): Le jour de référence (jour simulé, date d'un rapport...),
+                ou None pour le jour courant
+        
+        Raises:
+            TypeError: Si le jour de référence n'est ni une Date ni None
+        """
+        if jusqu_au is not None and not isinstance(jusqu_au, Date):
+            raise TypeError("Le jour de référence doit être une instance de la classe Date")
+        self._jusqu_au = jusqu_au
+    
+    def _calculer_jour_reference(self):
+        if self._jusqu_au is None:
+            return _date_iso.today().toordinal()
+        return self._jusqu_au.vers_ordinal()
+    
+    def enregistrer(self, location):
+        """
+        Enregistre une location et suit ses modifications
+        
+        Args:
+            location (Location): La location à enregistrer
+        """
+        if location in self._intervalles:
+            return
+        self._actualiser()
+        vehicule = location.get_vehicule()
+        self._calculer(location, vehicule)
+        self._locations.setdefault(vehicule, []).append(location)
+        self._marquer(*self._intervalles[location])
+        location.abonner(self._sur_modification, LocationModifiee)
+    
+    def retirer(self, location):
+        """
+        Retire une location du registre
+        
+        Args:
+            location (Location): La location à retirer
+        
+        Returns:
+            bool: True si la location était enregistrée, False sinon
+        """
+        if location not in self._intervalles:
+            return False
+        location.desabonner(self._sur_modification)
+        vehicule = self._intervalles.pop(location)[0]
+        del self._etats[location]
+        self._en_cours.discard(location)
+        self._locations[vehicule].remove(location)
+        self._reconstruire(vehicule)
+        return True
+    
+    def _calculer(self, location, vehicule):
+        """Calcule l'intervalle d'une location et note l'état de ses dates"""
+        debut = location.get_date_debut().vers_ordinal()
+        date_fin = location.get_date_fin()
+        if date_fin is None:
+            # En cours : occupée jusqu'au jour de référence inclus
+            fin = self._jour_reference + 1
+            self._en_cours.add(location)
+        else:
+            fin = date_fin.vers_ordinal()
+            self._en_cours.discard(location)
+        self._intervalles[location] = (vehicule, debut, max(fin, debut + 1))
+        self._etats[location] = self._etat_dates(location)
+    
+    def _etat_dates(self, location):
+        """Retourne les dates d'une location et leurs versions, pour détecter une modification sur place"""
+        debut, fin = location.get_date_debut(), location.get_date_fin()
+        return (debut, debut.get_version(), fin, None if fin is None else fin.get_version())
+    
+    def _actualiser(self):
+        """
+        Met à jour les bitsets avant une requête
+        
+        Les locations ne sont parcourues que si une date a été modifiée sur
+        place depuis la dernière requête, et les locations en cours que si
+        le jour de référence a changé.
+        """
+        a_reconstruire = set()
+        if Date.nb_modifications() != self._nb_modifications_dates:
+            self._nb_modifications_dates = Date.nb_modifications()
+            for location, (vehicule, _, _) in list(self._intervalles.items()):
+                if self._etat_dates(location) != self._etats[location]:
+                    self._calculer(location, vehicule)
+                    a_reconstruire.add(vehicule)
+        jour_reference = self._calculer_jour_reference()
+        if jour_reference != self._jour_reference:
+            self._jour_reference = jour_reference
+            for location in list(self._en_cours):
+                vehicule = self._intervalles[location][0]
+                self._calculer(location, vehicule)
+                a_reconstruire.add(vehicule)
+        for vehicule in a_reconstruire:
+            self._reconstruire(vehicule)
+    
+    def _sur_modification(self, evenement):
+        """Met à jour le registre quand les dates ou le véhicule d'une location changent"""
+        # terminer() passe par set_date_fin() : la fin d'une location arrive ici aussi
+        if evenement.attribut not in ("date_debut", "date_fin", "vehicule"):
+            return
+        location = evenement.source
+        ancien = self._intervalles[location][0]
+        vehicule = location.get_vehicule()
+        self._calculer(location, vehicule)
+        if vehicule is not ancien:
+            self._locations[ancien].remove(location)
+            self._locations.setdefault(vehicule, []).append(location)
+            self._reconstruire(ancien)
+        self._reconstruire(vehicule)
+    
+    def _reconstruire(self, vehicule):
+        """Recalcule les bitsets d'un véhicule à partir de ses locations enregistrées"""
+        self._bits.pop(vehicule, None)
+        locations = self._locations.get(vehicule)
+        if not locations:
+            self._locations.pop(vehicule, None)
+            return
+        for location in locations:
+            self._marquer(*self._intervalles[location])
+    
+    def _marquer(self, vehicule, debut, fin):
+        """Met à 1 les bits des jours [debut, fin[ d'un véhicule, année par année"""
+        annees = self._bits.setdefault(vehicule, {})
+        jour = debut
+        while jour < fin:
+            annee = Date.depuis_ordinal(jour).get_annee()
+            debut_annee = _premier_jour(annee)
+            fin_segment = min(fin, _premier_jour(annee + 1))
+            masque = ((1 << (fin_segment - jour)) - 1) << (jour - debut_annee)
+            annees[annee] = annees.get(annee, 0) | masque
+            jour = fin_segment
+    
+    def _bits_annee(self, vehicule, annee):
+        """Retourne le bitset d'un véhicule pour une année, sans actualiser le registre"""
+        return self._bits.get(vehicule, {}).get(annee, 0)
+    
+    def bitset(self, vehicule, annee):
+        """
+        Retourne le bitset des jours loués d'un véhicule pour une année
+        
+        Returns:
+            int: Le bit i vaut 1 si le véhicule est loué le i-ème jour de l'année
+        """
+        self._actualiser()
+        return self._bits_annee(vehicule, annee)
+    
+    def jours_occupes(self, vehicule, annee, mois=None):
+        """
+        Compte les jours de location d'un véhicule sur une année ou un mois
+        
+        Args:
+            vehicule (Vehicule): Le véhicule
+            annee (int): L'année
+            mois (int, optional): Le mois (1-12), None pour l'année entière. Defaults to None.
+        
+        Returns:
+            int: Le nombre de jours loués
+        """
+        masque, _ = _periode(annee, mois)
+        return _compter_bits(self.bitset(vehicule, annee) & masque)
+    
+    def taux_utilisation(self, vehicule, annee, mois=None):
+        """
+        Calcule la part des jours où un véhicule est loué
+        
+        Returns:
+            float: La part des jours loués sur la période (entre 0 et 1)
+        """
+        _, nb_jours = _periode(annee, mois)
+        return self.jours_occupes(vehicule, annee, mois) / nb_jours
+    
+    def taux_utilisation_flotte(self, vehicules, annee, mois=None):
+        """
+        Calcule la part des jours-véhicule loués sur un ensemble de véhicules
+        
+        Args:
+            vehicules (list): Les véhicules
+            annee (int): L'année
+            mois (int, optional): Le mois (1-12), None pour l'année entière. Defaults to None.
+        
+        Returns:
+            float: La part des jours-véhicule loués (0 si la liste est vide)
+        """
+        masque, nb_jours = _periode(annee, mois)
+        self._actualiser()
+        total = 0
+        nb_vehicules = 0
+        for vehicule in vehicules:
+            total += _compter_bits(self._bits_annee(vehicule, annee) & masque)
+            nb_vehicules += 1
+        return total / (nb_jours * nb_vehicules) if nb_vehicules else 0.0
+    
+    def taux_utilisation_par_type(self, parc, annee, mois=None):
+        """
+        Calcule le taux d'utilisation des voitures et des camions d'un parc
+        
+        Returns:
+            dict: {"Voiture": taux, "Camion": taux}
+        """
+        vehicules = parc.get_vehicules()
+        return {
+            "Voiture": self.taux_utilisation_flotte((v for v in vehicules if isinstance(v, Voiture)), annee, mois),
+            "Camion": self.taux_utilisation_flotte((v for v in vehicules if isinstance(v, Camion)), annee, mois),
+        }
+    
+    def plus_longue_inactivite(self, vehicule, annee, mois=None):
+        """
+        Calcule la plus longue suite de jours sans location d'un véhicule
+        
+        Returns:
+            int: Le nombre de jours consécutifs sans location le plus élevé de la période
+        """
+        masque, _ = _periode(annee, mois)
+        return _plus_longue_suite(~self.bitset(vehicule, annee) & masque)
+    
+    def jour_de_pointe(self, vehicules, annee):
+        """
+        Trouve le jour de l'année où le plus de véhicules sont loués
+        
+        Les bitsets sont additionnés en parallèle sur tous les jours dans des
+        compteurs « tranchés » (le plan i contient le bit i du compteur de
+        chaque jour), puis le maximum est isolé plan par plan, du poids fort
+        au poids faible.
+        
+        Args:
+            vehicules (list): Les véhicules
+            annee (int): L'année
+        
+        Returns:
+            tuple: (Date du premier jour de pointe, nombre de véhicules loués ce jour-là),
+                ou (None, 0) si aucun véhicule n'est loué dans l'année
+        """
+        self._actualiser()
+        plans = []
+        for vehicule in vehicules:
+            retenue = self._bits_annee(vehicule, annee)
+            i = 0
+            while retenue:
+                if i == len(plans):
+                    plans.append(retenue)
+                    break
+                plans[i], retenue = plans[i] ^ retenue, plans[i] & retenue
+                i += 1
+        
+        candidats, _ = _periode(annee)
+        maximum = 0
+        for i in reversed(range(len(plans))):
+            restants = candidats & plans[i]
+            if restants:
+                candidats = restants
+                maximum |= 1 << i
+        
+        if maximum == 0:
+            return None, 0
+        jour = (candidats & -candidats).bit_length() - 1
+        return Date.depuis_ordinal(_premier_jour(annee) + jour), maximum
\ No newline at end of file
@@ -1,6 +1,14 @@
-from vehicule import Vehicule, Voiture, Camion
+import threading
+import weakref
 
-class ParcAuto:
+from vehicule import Vehicule
+from evenement import BusEvenements, Observable, VehiculeAjoute, VehiculeSupprime, VehiculeModifie, VehiculeLoue, VehiculeRendu
+from planificateur import IndexVehicules, Planificateur, normaliser_criteres
+from requete import RequeteVehicules
+from rendu import afficher_listing, formater_parc
+from instantane import InstantaneParc
+
+class ParcAuto(Observable):
     """Classe représentant le parc automobile"""
     
     def __init__(self, nom):
@@ -12,6 +20,35 @@ class ParcAuto:
         """
         self._nom = nom
         self._vehicules = []
+        self._index = IndexVehicules()
+        self._planificateur = Planificateur()
+        self._version = 0
+        self._instantanes = weakref.WeakSet()
+        self._verrou = threading.Lock()
+        self._creer_canal()
+    
+    def __getstate__(self):
+        """
+        Retourne l'état à sérialiser (pickle, copy)
+        
+        Le verrou, les instantanés, les index, le canal et les abonnés du parc
+        ne sont pas sérialisés : __setstate__ recrée les quatre premiers, et
+        les abonnements doivent être refaits après la désérialisation.
+        """
+        etat = self.__dict__.copy()
+        for attribut in ("_verrou", "_instantanes", "_index", "_canal", "_bus"):
+            etat.pop(attribut, None)
+        return etat
+    
+    def __setstate__(self, etat):
+        """Restaure un parc sérialisé : verrou, instantanés, index et canal sont recréés"""
+        self.__dict__.update(etat)
+        self._verrou = threading.Lock()
+        self._instantanes = weakref.WeakSet()
+        self._index = IndexVehicules()
+        self._creer_canal()
+        for vehicule in self._vehicules:
+            self._indexer(vehicule)
     
     # Getters et setters pour nom
     def get_nom(self):
@@ -37,6 +74,18 @@ class ParcAuto:
         """
         return self._vehicules
     
+    def __contains__(self, vehicule):
+        """
+        Indique si un véhicule fait partie du parc automobile
+        
+        Args:
+            vehicule (Vehicule): Le véhicule recherché
+        
+        Returns:
+            bool: True si le véhicule est dans le parc, False sinon
+        """
+        return vehicule in self._index
+    
     def ajouter_vehicule(self, vehicule):
         """
         Ajoute un véhicule au parc automobile
@@ -54,16 +103,42 @@ class ParcAuto:
             raise TypeError("Le véhicule doit être une instance de la classe Vehicule")
         
         # Vérifier que le véhicule n'est pas déjà dans le parc
-        for v in self._vehicules:
+        # (seuls les véhicules de même marque, à la casse près, sont comparés)
+        for v in self._index.candidats("marque", vehicule.get_fiche().get_cle_marque()):
             if (v.get_marque() == vehicule.get_marque() and 
                 v.get_modele() == vehicule.get_modele() and 
                 v.get_annee() == vehicule.get_annee()):
                 # Véhicule similaire déjà présent
                 return False
         
-        self._vehicules.append(vehicule)
+        with self._verrou:
+            self._avant_modification_structurelle()
+            self._vehicules.append(vehicule)
+        self._indexer(vehicule)
+        if self._bus is not None:
+            self._bus.publier(VehiculeAjoute(self, vehicule))
         return True
     
+    def charger_vehicules(self, vehicules):
+        """
+        Ajoute en bloc des véhicules provenant d'un parc déjà constitué
+        
+        Contrairement à ajouter_vehicule(), aucune recherche de doublon n'est
+        faite : les véhicules doivent déjà respecter l'unicité du parc d'origine.
+        
+        Args:
+            vehicules (iterable): Les véhicules à ajouter
+        """
+        with self._verrou:
+            self._avant_modification_structurelle()
+            debut = len(self._vehicules)
+            self._vehicules.extend(vehicules)
+        for vehicule in self._vehicules[debut:]:
+            self._indexer(vehicule)
+        if self._bus is not None:
+            for vehicule in self._vehicules[debut:]:
+                self._bus.publier(VehiculeAjoute(self, vehicule))
+    
     def supprimer_vehicule(self, vehicule):
         """
         Supprime un véhicule du parc automobile
@@ -74,8 +149,17 @@ class ParcAuto:
         Returns:
             bool: True si le véhicule a été supprimé, False s'il n'était pas dans le parc
         """
-        if vehicule in self._vehicules:
-            self._vehicules.remove(vehicule)
+        if vehicule in self._index:
+            with self._verrou:
+                self._avant_modification_structurelle()
+                # Le parc ne suivra plus ce véhicule : les instantanés figent ses valeurs
+                for instantane in tuple(self._instantanes):
+                    instantane._figer_vehicule(vehicule)
+                self._vehicules.remove(vehicule)
+            self._index.retirer(vehicule)
+            vehicule._quitter_canal(self._canal)
+            if self._bus is not None:
+                self._bus.publier(VehiculeSupprime(self, vehicule))
             return True
         return False
     
@@ -83,6 +167,9 @@ class ParcAuto:
         """
         Recherche des véhicules dans le parc automobile selon différents critères
         
+        Le plan d'accès (parcours complet, index seul ou intersection d'index)
+        est choisi selon la cardinalité des critères, voir expliquer_recherche().
+        
         Args:
             marque (str, optional): La marque des véhicules recherchés. Defaults to None.
             modele (str, optional): Le modèle des véhicules recherchés. Defaults to None.
@@ -93,42 +180,151 @@ class ParcAuto:
         Returns:
             list: La liste des véhicules correspondant aux critères
         """
-        resultats = []
+        criteres = normaliser_criteres(marque, modele, annee, disponible, type_vehicule)
+        return self._planificateur.planifier(self._index, criteres).executer(self._index)
+    
+    def requete(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None):
+        """
+        Prépare une recherche paresseuse de véhicules
         
-        for vehicule in self._vehicules:
-            match = True
-            
-            if marque is not None and vehicule.get_marque().lower() != marque.lower():
-                match = False
-                
-            if modele is not None and vehicule.get_modele().lower() != modele.lower():
-                match = False
-                
-            if annee is not None and vehicule.get_annee() != annee:
-                match = False
-                
-            if disponible is not None and vehicule.est_disponible() != disponible:
-                match = False
-                
-            if type_vehicule is not None:
-                if type_vehicule.lower() == "voiture" and not isinstance(vehicule, Voiture):
-                    match = False
-                elif type_vehicule.lower() == "camion" and not isinstance(vehicule, Camion):
-                    match = False
-            
-            if match:
-                resultats.append(vehicule)
-        
-        return resultats
-    
-    def lister_vehicules_disponibles(self):
-        """
-        Liste tous les véhicules disponibles dans le parc automobile
+        Les arguments sont ceux de rechercher_vehicule(). Contrairement à
+        celle-ci, aucune liste n'est construite : la requête se parcourt,
+        se limite, se compte ou s'interroge avec premier() et existe().
+        
+        Returns:
+            RequeteVehicules: La requête, non encore exécutée
+        """
+        criteres = normaliser_criteres(marque, modele, annee, disponible, type_vehicule)
+        return RequeteVehicules(self._index, self._planificateur, criteres)
+    
+    def expliquer_recherche(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None):
+        """
+        Exécute une recherche et décrit le plan choisi par le planificateur
+        
+        Les arguments sont ceux de rechercher_vehicule().
+        
+        Returns:
+            str: Le plan, avec les nombres de lignes estimé et réel
+        """
+        criteres = normaliser_criteres(marque, modele, annee, disponible, type_vehicule)
+        plan = self._planificateur.planifier(self._index, criteres)
+        plan.executer(self._index)
+        return plan.afficher()
+    
+    def statistiques_index(self):
+        """
+        Retourne les statistiques de cardinalité utilisées par le planificateur
+        
+        Returns:
+            dict: Pour chaque attribut, un couple (nombre de valeurs distinctes, plus grand effectif)
+        """
+        return self._index.statistiques()
+    
+    def _creer_canal(self):
+        """Crée le canal sur lequel les véhicules du parc publient leurs événements"""
+        self._canal = BusEvenements()
+        # Abonnement immédiat : les index restent justes pendant un lot d'événements
+        self._canal.abonner(self._sur_modification_vehicule, VehiculeModifie, VehiculeLoue, VehiculeRendu,
+                            immediat=True)
+    
+    def _indexer(self, vehicule):
+        """Indexe un véhicule du parc et suit ses modifications"""
+        self._index.ajouter(vehicule)
+        vehicule._rejoindre_canal(self._canal)
+    
+    def abonner_vehicules(self, rappel, *types_evenement, immediat=False):
+        """
+        Abonne une fonction aux événements de tous les véhicules du parc
+        
+        Un véhicule ajouté au parc est suivi dès son ajout, un véhicule
+        supprimé cesse de l'être.
+        
+        Args:
+            rappel (callable): La fonction appelée avec l'événement en argument
+            *types_evenement (type): Les classes d'événements à recevoir (toutes si aucune)
+            immediat (bool, optional): Recevoir les événements même au cours
+                d'un lot (voir BusEvenements). Defaults to False.
+        """
+        self._canal.abonner(rappel, *types_evenement, immediat=immediat)
+    
+    def desabonner_vehicules(self, rappel):
+        """
+        Désabonne une fonction des événements des véhicules du parc
+        
+        Args:
+            rappel (callable): La fonction à désabonner
+        
+        Returns:
+            bool: True si la fonction était abonnée, False sinon
+        """
+        return self._canal.desabonner(rappel)
+    
+    def _sur_modification_vehicule(self, evenement):
+        """Met à jour les index et les instantanés quand un véhicule du parc est modifié"""
+        if evenement.source not in self._index:
+            # Véhicule qui ne fait pas (ou plus) partie du parc
+            return
+        self._version += 1
+        if self._instantanes:
+            if isinstance(evenement, VehiculeModifie):
+                attribut, ancienne_valeur = evenement.attribut, evenement.ancienne_valeur
+            else:
+                attribut, ancienne_valeur = "disponible", isinstance(evenement, VehiculeLoue)
+            for instantane in tuple(self._instantanes):
+                instantane._noter_ancienne_valeur(evenement.source, attribut, ancienne_valeur)
+        self._index.reindexer(evenement.source)
+    
+    def _avant_modification_structurelle(self):
+        """Fait copier la liste des véhicules aux instantanés qui la partagent encore"""
+        self._version += 1
+        for instantane in tuple(self._instantanes):
+            instantane._copier_liste()
+    
+    def get_version(self):
+        """
+        Retourne la version du parc, incrémentée à chaque modification du parc ou de ses véhicules
+        
+        Returns:
+            int: La version courante du parc
+        """
+        return self._version
+    
+    def instantane(self):
+        """
+        Prend un instantané en lecture seule du parc (copie sur écriture)
+        
+        Les rapports longs peuvent lire un état cohérent du parc pendant que
+        les locations, retours et ajouts continuent. L'instantané ne copie
+        rien à sa création ; appeler liberer() (ou l'utiliser dans un bloc
+        with) dès qu'il n'est plus utile pour qu'il cesse de suivre les
+        modifications.
+        
+        Returns:
+            InstantaneParc: L'instantané du parc
+        """
+        with self._verrou:
+            instantane = InstantaneParc(self, self._vehicules, self._version)
+            self._instantanes.add(instantane)
+        return instantane
+    
+    def _liberer_instantane(self, instantane):
+        """Cesse de tenir un instantané informé des modifications"""
+        self._instantanes.discard(instantane)
+    
+    def lister_vehicules_disponibles(self, limite=None, decalage=0):
+        """
+        Liste les véhicules disponibles dans le parc automobile
+        
+        Args:
+            limite (int, optional): Le nombre maximal de véhicules à lister. Defaults to None.
+            decalage (int, optional): Le nombre de véhicules disponibles à sauter. Defaults to 0.
         
         Returns:
             list: La liste des véhicules disponibles
         """
-        return self.rechercher_vehicule(disponible=True)
+        if limite is None and decalage == 0:
+            return self.rechercher_vehicule(disponible=True)
+        return self.requete(disponible=True).decaler(decalage).limiter(limite).liste()
     
     def compter_vehicules(self, disponible=None, type_vehicule=None):
         """
@@ -141,12 +337,16 @@ class ParcAuto:
         Returns:
             int: Le nombre de véhicules correspondant aux critères
         """
-        return len(self.rechercher_vehicule(disponible=disponible, type_vehicule=type_vehicule))
+        return self.requete(disponible=disponible, type_vehicule=type_vehicule).compter()
     
-    def afficher_parc(self):
+    def afficher_parc(self, nb_processus=1):
         """
         Affiche les informations du parc automobile
         
+        Args:
+            nb_processus (int, optional): Le nombre de processus utilisés pour mettre en forme
+                les véhicules dont l'affichage n'est pas en cache (None pour un par cœur). Defaults to 1.
+        
         Returns:
             str: Une chaîne contenant les informations du parc automobile
         """
@@ -156,14 +356,5 @@ class ParcAuto:
         nb_disponibles = self.compter_vehicules(disponible=True)
         nb_loues = self.compter_vehicules(disponible=False)
         
-        info = f"Parc automobile: {self.get_nom()}\n"
-        info += f"Nombre total de véhicules: {nb_total}\n"
-        info += f"Voitures: {nb_voitures}, Camions: {nb_camions}\n"
-        info += f"Véhicules disponibles: {nb_disponibles}, Véhicules loués: {nb_loues}\n\n"
-        
-        if nb_total > 0:
-            info += "Liste des véhicules:\n"
-            for i, vehicule in enumerate(self._vehicules, 1):
-                info += f"{i}. {vehicule.afficher_info()}\n"
-        
-        return info
\ No newline at end of file
+        listing = afficher_listing(self._vehicules, nb_processus) if nb_total > 0 else ""
+        return formater_parc(self.get_nom(), nb_total, nb_voitures, nb_camions, nb_disponibles, nb_loues, listing)
\ No newline at end of file
@@ -0,0 +1,426 @@
+from heapq import nsmallest
+from itertools import islice
+from math import log2
+from operator import itemgetter
+
+from vehicule import Voiture, Camion
+
+# Attributs indexés, dans l'ordre des clés normalisées d'un véhicule
+ATTRIBUTS = ("marque", "modele", "annee", "disponible", "type")
+_POSITION = {attribut: i for i, attribut in enumerate(ATTRIBUTS)}
+
+
+def cles_vehicule(vehicule):
+    """
+    Calcule les clés normalisées d'un véhicule, telles que comparées par rechercher_vehicule()
+    
+    Args:
+        vehicule (Vehicule): Le véhicule
+    
+    Returns:
+        tuple: (marque, modele, annee, disponible, type) avec marque et modèle en minuscules
+    """
+    if isinstance(vehicule, Voiture):
+        type_vehicule = "voiture"
+    elif isinstance(vehicule, Camion):
+        type_vehicule = "camion"
+    else:
+        type_vehicule = None
+    # Les formes en minuscules sont calculées une fois par fiche, et internées
+    fiche = vehicule.get_fiche()
+    return (fiche.get_cle_marque(), fiche.get_cle_modele(),
+            fiche.get_annee(), vehicule.est_disponible(), type_vehicule)
+
+
+def normaliser_criteres(marque=None, modele=None, annee=None, disponible=None, type_vehicule=None):
+    """
+    Convertit les critères de rechercher_vehicule() en prédicats sur les clés normalisées
+    
+    Un type de véhicule autre que "Voiture" ou "Camion" ne filtre rien,
+    comme dans la recherche d'origine.
+    
+    Returns:
+        list: Les prédicats sous forme de couples (attribut, clé)
+    """
+    criteres = []
+    if marque is not None:
+        criteres.append(("marque", marque.lower()))
+    if modele is not None:
+        criteres.append(("modele", modele.lower()))
+    if annee is not None:
+        criteres.append(("annee", annee))
+    if disponible is not None:
+        criteres.append(("disponible", disponible))
+    if type_vehicule is not None and type_vehicule.lower() in ("voiture", "camion"):
+        criteres.append(("type", type_vehicule.lower()))
+    return criteres
+
+
+class IndexVehicules:
+    """
+    Index secondaires d'un parc automobile, un par attribut recherché
+    
+    Chaque index associe une clé normalisée à l'ensemble ordonné des véhicules
+    qui la portent ; la taille de ces ensembles sert de statistique de
+    cardinalité exacte au planificateur.
+    """
+    
+    def __init__(self):
+        """Initialise des index vides"""
+        self._index = {attribut: {} for attribut in ATTRIBUTS}
+        self._cles = {}
+        self._rangs = {}
+        self._prochain_rang = 0
+    
+    def __len__(self):
+        return len(self._cles)
+    
+    def __contains__(self, vehicule):
+        return vehicule in self._cles
+    
+    def ajouter(self, vehicule):
+        """
+        Indexe un véhicule
+        
+        Args:
+            vehicule (Vehicule): Le véhicule à indexer
+        """
+        cles = cles_vehicule(vehicule)
+        self._cles[vehicule] = cles
+        self._rangs[vehicule] = self._prochain_rang
+        self._prochain_rang += 1
+        for attribut, cle in zip(ATTRIBUTS, cles):
+            self._index[attribut].setdefault(cle, {})[vehicule] = None
+    
+    def retirer(self, vehicule):
+        """
+        Retire un véhicule des index
+        
+        Args:
+            vehicule (Vehicule): Le véhicule à retirer
+        """
+        cles = self._cles.pop(vehicule)
+        del self._rangs[vehicule]
+        self._retirer_cles(vehicule, cles)
+    
+    def reindexer(self, vehicule):
+        """
+        Met à jour les index d'un véhicule dont un attribut a changé
+        
+        Args:
+            vehicule (Vehicule): Le véhicule modifié
+        """
+        anciennes = self._cles[vehicule]
+        nouvelles = cles_vehicule(vehicule)
+        if nouvelles == anciennes:
+            return
+        
+        self._cles[vehicule] = nouvelles
+        for attribut, ancienne, nouvelle in zip(ATTRIBUTS, anciennes, nouvelles):
+            if ancienne != nouvelle:
+                self._retirer_cle(attribut, ancienne, vehicule)
+                self._index[attribut].setdefault(nouvelle, {})[vehicule] = None
+    
+    def _retirer_cles(self, vehicule, cles):
+        for attribut, cle in zip(ATTRIBUTS, cles):
+            self._retirer_cle(attribut, cle, vehicule)
+    
+    def _retirer_cle(self, attribut, cle, vehicule):
+        vehicules = self._index[attribut][cle]
+        del vehicules[vehicule]
+        if not vehicules:
+            del self._index[attribut][cle]
+    
+    def candidats(self, attribut, cle):
+        """
+        Retourne les véhicules dont l'attribut a la clé donnée
+        
+        Returns:
+            dict: Les véhicules (en clés du dictionnaire), à ne pas modifier
+        """
+        return self._index[attribut].get(cle, {})
+    
+    def cardinalite(self, attribut, cle):
+        """Retourne le nombre de véhicules dont l'attribut a la clé donnée"""
+        return len(self._index[attribut].get(cle, ()))
+    
+    def statistiques(self):
+        """
+        Retourne les statistiques de cardinalité de chaque attribut
+        
+        Returns:
+            dict: Pour chaque attribut, un couple (nombre de valeurs distinctes, plus grand effectif)
+        """
+        return {attribut: (len(index), max(map(len, index.values()), default=0))
+                for attribut, index in self._index.items()}
+    
+    def parcourir(self):
+        """Itère sur les couples (véhicule, clés normalisées) dans l'ordre d'ajout"""
+        return iter(self._cles.items())
+    
+    def table_cles(self):
+        """
+        Retourne la table des clés normalisées des véhicules indexés
+        
+        Returns:
+            dict: Véhicule -> clés normalisées, à ne pas modifier
+        """
+        return self._cles
+    
+    def table_rangs(self):
+        """
+        Retourne la table des rangs d'ajout, qui donnent l'ordre du parc
+        
+        Returns:
+            dict: Véhicule -> rang d'ajout, à ne pas modifier
+        """
+        return self._rangs
+
+
+class PlanRecherche:
+    """Plan d'exécution d'une recherche de véhicules choisi par le planificateur"""
+    
+    PARCOURS = "parcours"
+    INDEX = "index + filtre"
+    INTERSECTION = "intersection d'index"
+    
+    def __init__(self, strategie, criteres, index_utilises, filtres, lignes_estimees, cout, cout_parcours):
+        """
+        Initialise un plan de recherche
+        
+        Args:
+            strategie (str): PARCOURS, INDEX ou INTERSECTION
+            criteres (list): Tous les prédicats (attribut, clé) de la recherche
+            index_utilises (list): Les prédicats résolus par index, le plus sélectif en premier
+            filtres (list): Les prédicats vérifiés ligne par ligne
+            lignes_estimees (float): Le nombre de véhicules estimé en résultat
+            cout (float): Le coût estimé du plan
+            cout_parcours (float): Le coût estimé d'un parcours complet, pour comparaison
+        """
+        self.strategie = strategie
+        self.criteres = criteres
+        self.index_utilises = index_utilises
+        self.filtres = filtres
+        self.lignes_estimees = lignes_estimees
+        self.cout = cout
+        self.cout_parcours = cout_parcours
+        self.lignes_reelles = None
+    
+    def _filtre(self):
+        """Retourne (extraire, attendu) pour comparer les clés filtrées en une fois, ou None"""
+        if not self.filtres:
+            return None
+        extraire = itemgetter(*(_POSITION[attribut] for attribut, _ in self.filtres))
+        attendu = tuple(cle for _, cle in self.filtres)
+        if len(attendu) == 1:
+            attendu = attendu[0]
+        return extraire, attendu
+    
+    def _parcourir(self, index):
+        """Itère, dans l'ordre du parc, sur les véhicules qui satisfont les filtres"""
+        filtre = self._filtre()
+        if filtre is None:
+            return (vehicule for vehicule, _ in index.parcourir())
+        extraire, attendu = filtre
+        return (vehicule for vehicule, cles in index.parcourir() if extraire(cles) == attendu)
+    
+    def _candidats(self, index):
+        """Itère, sans ordre, sur les véhicules trouvés par index sans construire d'ensemble"""
+        pilote = index.candidats(*self.index_utilises[0])
+        sondes = [index.candidats(attribut, cle) for attribut, cle in self.index_utilises[1:]]
+        filtre = self._filtre()
+        cles = index.table_cles()
+        for vehicule in pilote:
+            if all(vehicule in sonde for sonde in sondes):
+                if filtre is None or filtre[0](cles[vehicule]) == filtre[1]:
+                    yield vehicule
+    
+    def executer(self, index):
+        """
+        Exécute le plan sur les index d'un parc
+        
+        Args:
+            index (IndexVehicules): Les index du parc
+        
+        Returns:
+            list: Les véhicules trouvés, dans l'ordre du parc
+        """
+        if self.strategie == self.PARCOURS:
+            resultats = list(self._parcourir(index))
+        else:
+            candidats = index.candidats(*self.index_utilises[0]).keys()
+            for attribut, cle in self.index_utilises[1:]:
+                candidats = candidats & index.candidats(attribut, cle).keys()
+            filtre = self._filtre()
+            if filtre is not None:
+                extraire, attendu = filtre
+                cles = index.table_cles()
+                resultats = [vehicule for vehicule in candidats if extraire(cles[vehicule]) == attendu]
+            else:
+                resultats = list(candidats)
+            # Un véhicule réindexé passe en fin d'index et l'intersection
+            # d'ensembles perd tout ordre : on rétablit l'ordre du parc
+            resultats.sort(key=index.table_rangs().__getitem__)
+        
+        self.lignes_reelles = len(resultats)
+        return resultats
+    
+    def iterer(self, index, decalage=0, limite=None):
+        """
+        Itère paresseusement sur les résultats du plan, dans l'ordre du parc
+        
+        Un parcours s'arrête dès que la limite est atteinte ; un plan par index
+        ne garde que les decalage + limite premiers candidats au lieu de tous les trier.
+        
+        Args:
+            index (IndexVehicules): Les index du parc
+            decalage (int, optional): Le nombre de résultats à sauter. Defaults to 0.
+            limite (int, optional): Le nombre maximal de résultats. Defaults to None.
+        
+        Yields:
+            Vehicule: Les véhicules trouvés
+        """
+        fin = None if limite is None else decalage + limite
+        if self.strategie == self.PARCOURS:
+            yield from islice(self._parcourir(index), decalage, fin)
+            return
+        
+        rang = index.table_rangs().__getitem__
+        if fin is None:
+            ordonnes = sorted(self._candidats(index), key=rang)
+        else:
+            ordonnes = nsmallest(fin, self._candidats(index), key=rang)
+        yield from islice(ordonnes, decalage, None)
+    
+    def premier(self, index):
+        """
+        Retourne le premier résultat du plan dans l'ordre du parc
+        
+        Returns:
+            Vehicule: Le premier véhicule trouvé, ou None s'il n'y en a aucun
+        """
+        if self.strategie == self.PARCOURS:
+            return next(self._parcourir(index), None)
+        return min(self._candidats(index), key=index.table_rangs().__getitem__, default=None)
+    
+    def existe(self, index):
+        """Retourne True dès qu'un véhicule satisfait la recherche, sans ordonner les candidats"""
+        if self.strategie == self.PARCOURS:
+            return next(self._parcourir(index), None) is not None
+        return next(self._candidats(index), None) is not None
+    
+    def compter(self, index):
+        """
+        Compte les résultats sans construire de liste ni d'ensemble
+        
+        Un comptage n'a pas besoin de l'ordre du parc : quelle que soit la
+        stratégie du plan, il part de l'index le plus sélectif et sonde les
+        autres. Un critère unique se lit directement dans les statistiques.
+        
+        Returns:
+            int: Le nombre de véhicules trouvés
+        """
+        if not self.criteres:
+            return len(index)
+        
+        ordonnes = sorted(self.criteres, key=lambda critere: index.cardinalite(*critere))
+        if len(ordonnes) == 1:
+            return index.cardinalite(*ordonnes[0])
+        
+        sondes = [index.candidats(attribut, cle) for attribut, cle in ordonnes[1:]]
+        return sum(1 for vehicule in index.candidats(*ordonnes[0])
+                   if all(vehicule in sonde for sonde in sondes))
+    
+    def afficher(self):
+        """
+        Affiche le plan, avec les lignes réelles s'il a été exécuté
+        
+        Returns:
+            str: Une chaîne décrivant le plan
+        """
+        def decrire(predicats):
+            return ", ".join(f"{attribut}={cle!r}" for attribut, cle in predicats) or "aucun"
+        
+        info = f"Plan: {self.strategie}\n"
+        info += f"Index utilisés: {decrire(self.index_utilises)}\n"
+        info += f"Filtres: {decrire(self.filtres)}\n"
+        info += f"Coût estimé: {self.cout:.1f} (parcours complet: {self.cout_parcours:.1f})\n"
+        info += f"Lignes estimées: {self.lignes_estimees:.1f}"
+        if self.lignes_reelles is not None:
+            info += f", lignes réelles: {self.lignes_reelles}"
+        return info
+
+
+class Planificateur:
+    """
+    Planificateur de recherche fondé sur les coûts
+    
+    Les coûts sont exprimés en unités arbitraires : une unité correspond au
+    passage d'un véhicule dans la boucle d'un parcours complet. Un candidat
+    lu par index coûte plus cher (accès dispersé en mémoire et remise dans
+    l'ordre du parc), une intersection d'ensembles (écrite en C) moins cher.
+    """
+    
+    COUT_LIGNE = 1.0
+    COUT_FILTRE = 0.5
+    COUT_ACCES_INDEX = 2.0
+    COUT_ENSEMBLE = 0.3
+    COUT_TRI = 0.02
+    
+    def planifier(self, index, criteres, limite=None):
+        """
+        Choisit le plan le moins coûteux pour une recherche
+        
+        Les sélectivités des prédicats sont supposées indépendantes pour
+        estimer le nombre de lignes d'une conjonction.
+        
+        Args:
+            index (IndexVehicules): Les index du parc
+            criteres (list): Les prédicats (attribut, clé) de la recherche
+            limite (int, optional): Le nombre de résultats réellement consommés,
+                qui permet à un parcours de s'arrêter tôt. Defaults to None.
+        
+        Returns:
+            PlanRecherche: Le plan retenu
+        """
+        total = len(index)
+        cout_parcours = total * (self.COUT_LIGNE + len(criteres) * self.COUT_FILTRE)
+        
+        if not criteres or total == 0:
+            return PlanRecherche(PlanRecherche.PARCOURS, criteres, [], criteres,
+                                 float(total if not criteres else 0), cout_parcours, cout_parcours)
+        
+        tailles = {critere: index.cardinalite(*critere) for critere in criteres}
+        ordonnes = sorted(criteres, key=tailles.__getitem__)
+        
+        lignes = self._estimer(total, tailles, criteres)
+        cout = cout_parcours
+        if limite is not None and lignes > 0:
+            # Un parcours limité s'arrête après environ limite / sélectivité lignes
+            cout = min(total, limite * total / lignes) * (self.COUT_LIGNE + len(criteres) * self.COUT_FILTRE)
+        meilleur = PlanRecherche(PlanRecherche.PARCOURS, criteres, [], criteres, lignes, cout, cout_parcours)
+        
+        # Plans par index : les j prédicats les plus sélectifs sont résolus par
+        # index (intersection si j > 1), les autres filtrés sur les candidats
+        for j in range(1, len(ordonnes) + 1):
+            index_utilises, filtres = ordonnes[:j], ordonnes[j:]
+            pilote = tailles[index_utilises[0]]
+            candidats = self._estimer(total, tailles, index_utilises)
+            
+            strategie = PlanRecherche.INDEX if j == 1 else PlanRecherche.INTERSECTION
+            gardes = candidats if limite is None else min(candidats, limite)
+            cout = (pilote * (j - 1) * self.COUT_ENSEMBLE
+                    + candidats * (self.COUT_ACCES_INDEX + len(filtres) * self.COUT_FILTRE)
+                    + candidats * log2(gardes + 1) * self.COUT_TRI)
+            
+            if cout < meilleur.cout:
+                meilleur = PlanRecherche(strategie, criteres, index_utilises, filtres,
+                                         lignes, cout, cout_parcours)
+        
+        return meilleur
+    
+    def _estimer(self, total, tailles, criteres):
+        lignes = float(total)
+        for critere in criteres:
+            lignes *= tailles[critere] / total
+        return lignes
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# En dessous de ce nombre de chaînes à calculer, lancer des processus coûte
+# plus cher que de tout mettre en forme dans le processus courant. Le rendu
+# parallèle n'est utilisé que sur demande (nb_processus > 1) : chaque véhicule
+# envoyé coûte un tuple sérialisé, et la mise en forme est déjà partagée entre
+# véhicules identiques par leur fiche
+SEUIL_PARALLELE = 50000
+
+
+def _formater_lot(lot):
+    """Met en forme un lot de (classe, données) dans un processus de travail"""
+    return [classe.formater_info(*donnees) for classe, donnees in lot]
+
+
+def lignes_info(vehicules, nb_processus=1, taille_lot=20000):
+    """
+    Retourne les chaînes d'afficher_info() d'une liste de véhicules
+    
+    Les chaînes déjà en cache sont réutilisées. Avec plusieurs processus, les
+    autres sont mises en forme par lots dans un pool de processus, puis placées
+    dans le cache des véhicules. Seules les valeurs affichées (et non les
+    véhicules) sont envoyées aux processus ; les véhicules dont la classe ne
+    fournit pas donnees_info() sont mis en forme dans le processus courant.
+    
+    Args:
+        vehicules (list): Les véhicules à afficher
+        nb_processus (int, optional): Le nombre de processus de travail, None pour
+            os.cpu_count(). Defaults to 1 (pas de pool).
+        taille_lot (int, optional): Le nombre de véhicules envoyés par lot. Defaults to 20000.
+    
+    Returns:
+        list: Les chaînes d'informations, dans l'ordre des véhicules
+    """
+    nb_processus = nb_processus or os.cpu_count() or 1
+    if nb_processus == 1:
+        return [vehicule.afficher_info() for vehicule in vehicules]
+    
+    a_calculer = [vehicule for vehicule in vehicules if vehicule.info_en_cache() is None]
+    if len(a_calculer) < SEUIL_PARALLELE:
+        return [vehicule.afficher_info() for vehicule in vehicules]
+    
+    donnees = [(type(vehicule), vehicule.donnees_info()) for vehicule in a_calculer]
+    a_calculer = [vehicule for vehicule, (_, d) in zip(a_calculer, donnees) if d is not None]
+    donnees = [couple for couple in donnees if couple[1] is not None]
+    lots = [donnees[i:i + taille_lot] for i in range(0, len(donnees), taille_lot)]
+    with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+        debut = 0
+        for infos in executeur.map(_formater_lot, lots):
+            for vehicule, info in zip(a_calculer[debut:debut + len(infos)], infos):
+                vehicule.memoriser_info(info)
+            debut += len(infos)
+    
+    return [vehicule.afficher_info() for vehicule in vehicules]
+
+
+def afficher_listing(vehicules, nb_processus=1, taille_lot=20000):
+    """
+    Affiche une liste numérotée de véhicules, comme dans afficher_parc()
+    
+    Args:
+        vehicules (list): Les véhicules à afficher
+        nb_processus (int, optional): Le nombre de processus de travail, None pour
+            os.cpu_count(). Defaults to 1 (pas de pool).
+        taille_lot (int, optional): Le nombre de véhicules envoyés par lot. Defaults to 20000.
+    
+    Returns:
+        str: Une ligne "i. informations" par véhicule
+    """
+    infos = lignes_info(vehicules, nb_processus, taille_lot)
+    return "".join(f"{i}. {info}\n" for i, info in enumerate(infos, 1))
+
+
+def formater_parc(nom, nb_total, nb_voitures, nb_camions, nb_disponibles, nb_loues, listing):
+    """
+    Met en forme l'affichage d'un parc automobile (voir ParcAuto.afficher_parc)
+    
+    Args:
+        nom (str): Le nom du parc
+        nb_total (int): Le nombre total de véhicules
+        nb_voitures (int): Le nombre de voitures
+        nb_camions (int): Le nombre de camions
+        nb_disponibles (int): Le nombre de véhicules disponibles
+        nb_loues (int): Le nombre de véhicules loués
+        listing (str): La liste numérotée des véhicules, vide si le parc est vide
+    
+    Returns:
+        str: Une chaîne contenant les informations du parc automobile
+    """
+    info = f"Parc automobile: {nom}\n"
+    info += f"Nombre total de véhicules: {nb_total}\n"
+    info += f"Voitures: {nb_voitures}, Camions: {nb_camions}\n"
+    info += f"Véhicules disponibles: {nb_disponibles}, Véhicules loués: {nb_loues}\n\n"
+    
+    if nb_total > 0:
+        info += "Liste des véhicules:\n"
+        info += listing
+    
+    return info
\ No newline at end of file
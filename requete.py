@@ -0,0 +1,108 @@
+class RequeteVehicules:
+    """
+    Recherche paresseuse de véhicules dans un parc automobile
+    
+    Rien n'est calculé à la création : le plan est choisi et exécuté au moment
+    où la requête est parcourue, comptée ou interrogée. Les méthodes limiter()
+    et decaler() retournent une nouvelle requête, ce qui permet de les enchaîner.
+    Le parc ne doit pas recevoir ni perdre de véhicule pendant un parcours.
+    """
+    
+    def __init__(self, index, planificateur, criteres, decalage=0, limite=None):
+        """
+        Initialise une requête sur les index d'un parc
+        
+        Args:
+            index (IndexVehicules): Les index du parc
+            planificateur (Planificateur): Le planificateur du parc
+            criteres (list): Les prédicats (attribut, clé) de la recherche
+            decalage (int, optional): Le nombre de résultats à sauter. Defaults to 0.
+            limite (int, optional): Le nombre maximal de résultats. Defaults to None.
+        
+        Raises:
+            ValueError: Si le décalage ou la limite est négatif
+        """
+        if decalage < 0 or (limite is not None and limite < 0):
+            raise ValueError("Le décalage et la limite doivent être positifs")
+        self._index = index
+        self._planificateur = planificateur
+        self._criteres = criteres
+        self._decalage = decalage
+        self._limite = limite
+    
+    def limiter(self, limite):
+        """
+        Retourne la même requête limitée à un nombre de résultats
+        
+        Args:
+            limite (int): Le nombre maximal de résultats
+        
+        Returns:
+            RequeteVehicules: La nouvelle requête
+        """
+        return RequeteVehicules(self._index, self._planificateur, self._criteres, self._decalage, limite)
+    
+    def decaler(self, decalage):
+        """
+        Retourne la même requête en sautant les premiers résultats
+        
+        Args:
+            decalage (int): Le nombre de résultats à sauter
+        
+        Returns:
+            RequeteVehicules: La nouvelle requête
+        """
+        return RequeteVehicules(self._index, self._planificateur, self._criteres, decalage, self._limite)
+    
+    def _plan(self, limite=None):
+        return self._planificateur.planifier(self._index, self._criteres, limite)
+    
+    def __iter__(self):
+        """Itère sur les véhicules trouvés, dans l'ordre du parc"""
+        fin = None if self._limite is None else self._decalage + self._limite
+        return self._plan(fin).iterer(self._index, self._decalage, self._limite)
+    
+    def liste(self):
+        """
+        Retourne les véhicules trouvés sous forme de liste
+        
+        Returns:
+            list: Les véhicules trouvés, dans l'ordre du parc
+        """
+        return list(self)
+    
+    def premier(self):
+        """
+        Retourne le premier véhicule trouvé (après le décalage)
+        
+        Returns:
+            Vehicule: Le premier véhicule trouvé, ou None s'il n'y en a aucun
+        """
+        if self._limite == 0:
+            return None
+        if self._decalage:
+            return next(iter(self.limiter(1)), None)
+        return self._plan(1).premier(self._index)
+    
+    def existe(self):
+        """
+        Indique si au moins un véhicule satisfait la recherche
+        
+        Returns:
+            bool: True si la recherche a au moins un résultat (après le décalage)
+        """
+        if self._decalage or self._limite == 0:
+            return self.premier() is not None
+        return self._plan(1).existe(self._index)
+    
+    def compter(self):
+        """
+        Compte les véhicules trouvés sans construire la liste des résultats
+        
+        Returns:
+            int: Le nombre de véhicules trouvés, en tenant compte du décalage et de la limite
+        """
+        total = max(0, self._plan().compter(self._index) - self._decalage)
+        if self._limite is not None:
+            total = min(total, self._limite)
+        return total
\ No newline at end of file
@@ -0,0 +1,260 @@
+import asyncio
+
+from location import Location
+from planificateur import normaliser_criteres
+
+
+class ServiceReservation:
+    """
+    Service asynchrone de recherche et de réservation sur un parc automobile
+    
+    Les demandes reçues pendant une courte fenêtre sont regroupées en un lot,
+    traité d'un seul tenant dans la boucle asyncio : les recherches identiques
+    du lot ne sont exécutées qu'une fois, et les réservations de mêmes critères
+    se partagent une seule recherche des véhicules disponibles. Chaque
+    réservation vérifie la disponibilité et loue le véhicule sans rendre la
+    main à la boucle : deux réservations ne peuvent pas obtenir le même véhicule.
+    
+    Le service doit être utilisé depuis une seule boucle asyncio, et le parc
+    ne doit pas être modifié depuis un autre thread pendant qu'il tourne.
+    """
+    
+    def __init__(self, parc, fenetre=0.001, taille_max_lot=2000):
+        """
+        Initialise le service sur un parc automobile
+        
+        Args:
+            parc (ParcAuto): Le parc automobile servi
+            fenetre (float, optional): La durée de regroupement des demandes, en secondes. Defaults to 0.001.
+            taille_max_lot (int, optional): Le nombre de demandes qui déclenche le traitement
+                du lot sans attendre la fin de la fenêtre. Defaults to 2000.
+        
+        Raises:
+            ValueError: Si la fenêtre est négative ou si la taille maximale n'est pas positive
+        """
+        if fenetre < 0 or taille_max_lot < 1:
+            raise ValueError("La fenêtre doit être positive et la taille maximale du lot au moins 1")
+        self._parc = parc
+        self._fenetre = fenetre
+        self._taille_max_lot = taille_max_lot
+        self._recherches = {}
+        self._reservations = []
+        self._minuterie = None
+        self._nb_demandes = 0
+        self._nb_lots = 0
+        self._nb_recherches_executees = 0
+        self._nb_locations = 0
+    
+    def get_parc(self):
+        """Retourne le parc automobile servi"""
+        return self._parc
+    
+    def _taille_lot(self):
+        return len(self._recherches) + len(self._reservations)
+    
+    def _planifier_lot(self):
+        """Programme le traitement du lot en cours à la fin de la fenêtre, ou tout de suite s'il est plein"""
+        boucle = asyncio.get_running_loop()
+        if self._taille_lot() >= self._taille_max_lot:
+            if self._minuterie is not None:
+                self._minuterie.cancel()
+            self._minuterie = boucle.call_soon(self._traiter_lot)
+        elif self._minuterie is None:
+            self._minuterie = boucle.call_later(self._fenetre, self._traiter_lot)
+    
+    async def rechercher(self, marque=None, modele=None, annee=None, disponible=None, type_vehicule=None, limite=None):
+        """
+        Recherche des véhicules, en partageant l'exécution avec les recherches identiques du lot
+        
+        Les critères sont ceux de ParcAuto.rechercher_vehicule().
+        
+        Args:
+            limite (int, optional): Le nombre maximal de résultats. Defaults to None.
+        
+        Returns:
+            list: La liste des véhicules correspondant aux critères
+        """
+        self._nb_demandes += 1
+        cle = (tuple(normaliser_criteres(marque, modele, annee, disponible, type_vehicule)), limite)
+        attente = self._recherches.get(cle)
+        if attente is None:
+            criteres = dict(marque=marque, modele=modele, annee=annee,
+                            disponible=disponible, type_vehicule=type_vehicule)
+            attente = asyncio.get_running_loop().create_future()
+            self._recherches[cle] = (criteres, limite, attente)
+            self._planifier_lot()
+        else:
+            attente = attente[2]
+        # Le résultat est partagé : chaque demandeur reçoit sa propre liste, et
+        # l'annulation d'un demandeur n'annule pas l'attente des autres
+        return list(await asyncio.shield(attente))
+    
+    async def reserver(self, id_location, client, date_debut, date_fin=None,
+                       marque=None, modele=None, type_vehicule=None, vehicule=None):
+        """
+        Réserve un véhicule disponible correspondant aux critères
+        
+        Args:
+            id_location (str): L'identifiant de la location à créer
+            client (Client): Le client qui loue le véhicule
+            date_debut (Date): La date de début de la location
+            date_fin (Date, optional): La date de fin de la location. Defaults to None.
+            marque (str, optional): La marque souhaitée. Defaults to None.
+            modele (str, optional): Le modèle souhaité. Defaults to None.
+            type_vehicule (str, optional): Le type souhaité ("Voiture" ou "Camion"). Defaults to None.
+            vehicule (Vehicule, optional): Un véhicule précis, à la place des critères. Defaults to None.
+        
+        Returns:
+            Location: La location créée, ou None si aucun véhicule ne convient
+        
+        Raises:
+            TypeError: Si les types des arguments ne sont pas corrects (voir Location)
+        """
+        self._nb_demandes += 1
+        attente = asyncio.get_running_loop().create_future()
+        criteres = dict(marque=marque, modele=modele, type_vehicule=type_vehicule, disponible=True)
+        self._reservations.append((id_location, client, date_debut, date_fin, criteres, vehicule, attente))
+        self._planifier_lot()
+        return await attente
+    
+    async def rendre(self, location, date_fin):
+        """
+        Termine une location (voir Location.terminer)
+        
+        Returns:
+            float: Le prix final de la location
+        """
+        self._nb_demandes += 1
+        return location.terminer(date_fin)
+    
+    def _traiter_lot(self):
+        """Traite toutes les demandes du lot en cours"""
+        self._minuterie = None
+        recherches, self._recherches = self._recherches, {}
+        reservations, self._reservations = self._reservations, []
+        self._nb_lots += 1
+        
+        # Les réservations passent avant les recherches, qui voient donc le parc après le lot
+        self._traiter_reservations(reservations)
+        
+        for criteres, limite, attente in recherches.values():
+            if attente.cancelled():
+                continue
+            self._nb_recherches_executees += 1
+            try:
+                requete = self._parc.requete(**criteres)
+                if limite is not None:
+                    requete = requete.limiter(limite)
+                attente.set_result(requete.liste())
+            except Exception as exc:
+                attente.set_exception(exc)
+    
+    def _traiter_reservations(self, reservations):
+        """Affecte un véhicule à chaque réservation, dans l'ordre d'arrivée"""
+        # Par critères : nombre de réservations restantes, puis véhicules candidats et position
+        restantes = {}
+        for reservation in reservations:
+            if reservation[5] is None:
+                cle = tuple(sorted(reservation[4].items()))
+                restantes[cle] = restantes.get(cle, 0) + 1
+        candidats = {}
+        
+        for id_location, client, date_debut, date_fin, criteres, vehicule, attente in reservations:
+            if attente.cancelled():
+                continue
+            try:
+                if vehicule is None:
+                    cle = tuple(sorted(criteres.items()))
+                    vehicule = self._prochain_vehicule(cle, criteres, restantes[cle], candidats)
+                    restantes[cle] -= 1
+                if vehicule is None or not vehicule.est_disponible():
+                    attente.set_result(None)
+                    continue
+                attente.set_result(Location(id_location, client, vehicule, date_debut, date_fin))
+                self._nb_locations += 1
+            except Exception as exc:
+                attente.set_exception(exc)
+    
+    def _prochain_vehicule(self, cle, criteres, nb_restantes, candidats):
+        """
+        Retourne le prochain véhicule disponible pour des critères
+        
+        Une seule recherche, limitée au nombre de réservations restantes pour
+        ces critères, sert à tout le lot ; elle n'est relancée que si d'autres
+        réservations du lot ont pris les véhicules qu'elle avait trouvés.
+        """
+        vehicules, position = candidats.get(cle, (None, 0))
+        while True:
+            if vehicules is not None:
+                while position < len(vehicules):
+                    vehicule = vehicules[position]
+                    position += 1
+                    if vehicule.est_disponible():
+                        candidats[cle] = (vehicules, position)
+                        return vehicule
+                if not vehicules:
+                    # La dernière recherche n'a rien trouvé : inutile de recommencer
+                    return None
+            self._nb_recherches_executees += 1
+            vehicules, position = self._parc.requete(**criteres).limiter(nb_restantes).liste(), 0
+            candidats[cle] = (vehicules, 0)
+    
+    def statistiques(self):
+        """
+        Retourne les compteurs du service
+        
+        Returns:
+            dict: Les nombres de demandes, de lots traités, de recherches exécutées et de locations créées
+        """
+        return {
+            "demandes": self._nb_demandes,
+            "lots": self._nb_lots,
+            "recherches": self._nb_recherches_executees,
+            "locations": self._nb_locations,
+        }
+
+
+class ClientLocal:
+    """
+    Client en mémoire d'un ServiceReservation, sans passer par le réseau
+    
+    Chaque appel crée la demande dans la boucle asyncio du service, comme le
+    ferait un gestionnaire de requêtes d'API ; rafale() envoie un ensemble de
+    demandes en même temps, ce qui permet de tester le regroupement en lots.
+    """
+    
+    def __init__(self, service):
+        """
+        Initialise un client local
+        
+        Args:
+            service (ServiceReservation): Le service appelé
+        """
+        self._service = service
+    
+    async def rechercher(self, **criteres):
+        """Recherche des véhicules (voir ServiceReservation.rechercher)"""
+        return await self._service.rechercher(**criteres)
+    
+    async def reserver(self, id_location, client, date_debut, date_fin=None, **criteres):
+        """Réserve un véhicule (voir ServiceReservation.reserver)"""
+        return await self._service.reserver(id_location, client, date_debut, date_fin, **criteres)
+    
+    async def rendre(self, location, date_fin):
+        """Termine une location (voir ServiceReservation.rendre)"""
+        return await self._service.rendre(location, date_fin)
+    
+    async def rafale(self, demandes):
+        """
+        Envoie des demandes en même temps et attend toutes les réponses
+        
+        Args:
+            demandes (list): Des couples (nom de méthode, arguments nommés),
+                par exemple ("reserver", {"id_location": "L1", ...})
+        
+        Returns:
+            list: Les réponses, dans l'ordre des demandes ; une demande en
+                erreur a son exception pour réponse
+        """
+        return await asyncio.gather(*(getattr(self, methode)(**arguments) for methode, arguments in demandes),
+                                    return_exceptions=True)
\ No newline at end of file
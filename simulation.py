@@ -0,0 +1,329 @@
+import heapq
+import random
+import time
+import tracemalloc
+
+from vehicule import Voiture, Camion
+from client import Client
+from date import Date
+from location import Location
+from parc_auto import ParcAuto
+
+RECHERCHE = "recherche"
+LOCATION = "location"
+RETOUR = "retour"
+
+
+class ConfigurationSimulation:
+    """Paramètres d'une simulation de charge du parc automobile"""
+    
+    def __init__(self, graine=0, nb_vehicules=1000, part_camions=0.25, nb_clients=500,
+                 nb_semaines=4, recherches_par_jour=2000.0, locations_par_jour=100.0,
+                 duree_moyenne_location=4.0, taille_page=20, date_debut=None, suivre_memoire=True):
+        """
+        Initialise une configuration de simulation
+        
+        Args:
+            graine (int, optional): La graine du générateur aléatoire. Defaults to 0.
+            nb_vehicules (int, optional): Le nombre de véhicules du parc synthétique. Defaults to 1000.
+            part_camions (float, optional): La part de camions dans le parc. Defaults to 0.25.
+            nb_clients (int, optional): Le nombre de clients synthétiques. Defaults to 500.
+            nb_semaines (int, optional): La durée simulée en semaines. Defaults to 4.
+            recherches_par_jour (float, optional): Le taux moyen d'arrivée des recherches. Defaults to 2000.0.
+            locations_par_jour (float, optional): Le taux moyen d'arrivée des demandes de location. Defaults to 100.0.
+            duree_moyenne_location (float, optional): La durée moyenne d'une location en jours. Defaults to 4.0.
+            taille_page (int, optional): Le nombre de résultats affichés par recherche. Defaults to 20.
+            date_debut (Date, optional): Le premier jour simulé. Defaults to le 01/01/2025.
+            suivre_memoire (bool, optional): Mesurer aussi la mémoire avec tracemalloc, dans
+                une seconde exécution de la même simulation : les latences et le débit sont
+                mesurés sans tracemalloc (un suivi déjà lancé par l'appelant est réutilisé
+                et laissé actif). Defaults to True.
+        """
+        self.graine = graine
+        self.nb_vehicules = nb_vehicules
+        self.part_camions = part_camions
+        self.nb_clients = nb_clients
+        self.nb_semaines = nb_semaines
+        self.recherches_par_jour = recherches_par_jour
+        self.locations_par_jour = locations_par_jour
+        self.duree_moyenne_location = duree_moyenne_location
+        self.taille_page = taille_page
+        self.date_debut = date_debut if date_debut is not None else Date(1, 1, 2025)
+        self.suivre_memoire = suivre_memoire
+
+
+def _centile(valeurs_triees, centile):
+    """Retourne le centile d'une liste triée (méthode du rang le plus proche)"""
+    if not valeurs_triees:
+        return 0.0
+    rang = max(0, min(len(valeurs_triees) - 1, int(round(centile / 100 * len(valeurs_triees))) - 1))
+    return valeurs_triees[rang]
+
+
+class RapportSimulation:
+    """Mesures collectées pendant une simulation"""
+    
+    def __init__(self, configuration):
+        """
+        Initialise un rapport vide
+        
+        Args:
+            configuration (ConfigurationSimulation): La configuration simulée
+        """
+        self.configuration = configuration
+        self.latences = {RECHERCHE: [], LOCATION: [], RETOUR: []}
+        self.locations_refusees = 0
+        self.duree_reelle = 0.0
+        # Mémoire allouée (octets) à la fin de chaque jour simulé
+        self.memoire_par_jour = []
+        self.memoire_pic = 0
+    
+    def nb_operations(self):
+        """Retourne le nombre total d'opérations exécutées"""
+        return sum(len(latences) for latences in self.latences.values())
+    
+    def debit(self):
+        """Retourne le nombre d'opérations exécutées par seconde réelle"""
+        return self.nb_operations() / self.duree_reelle if self.duree_reelle else 0.0
+    
+    def centiles(self, operation):
+        """
+        Retourne les centiles de latence d'une opération
+        
+        Args:
+            operation (str): RECHERCHE, LOCATION ou RETOUR
+        
+        Returns:
+            dict: Les latences p50, p95, p99 et max, en microsecondes
+        """
+        valeurs = sorted(self.latences[operation])
+        return {
+            "p50": _centile(valeurs, 50) * 1e6,
+            "p95": _centile(valeurs, 95) * 1e6,
+            "p99": _centile(valeurs, 99) * 1e6,
+            "max": (valeurs[-1] if valeurs else 0.0) * 1e6,
+        }
+    
+    def croissance_memoire_par_semaine(self):
+        """Retourne la croissance moyenne de la mémoire allouée par semaine simulée, en octets"""
+        if len(self.memoire_par_jour) < 2:
+            return 0.0
+        jours = len(self.memoire_par_jour) - 1
+        return (self.memoire_par_jour[-1] - self.memoire_par_jour[0]) * 7 / jours
+    
+    def afficher(self):
+        """
+        Affiche le rapport de simulation
+        
+        Returns:
+            str: Une chaîne contenant les mesures de la simulation
+        """
+        config = self.configuration
+        info = (f"Simulation: {config.nb_vehicules} véhicules, {config.nb_clients} clients, "
+                f"{config.nb_semaines} semaine(s), graine {config.graine}\n")
+        info += f"Opérations: {self.nb_operations()} en {self.duree_reelle:.2f} s ({self.debit():.0f} op/s)\n"
+        for operation in (RECHERCHE, LOCATION, RETOUR):
+            c = self.centiles(operation)
+            info += (f"{operation}: {len(self.latences[operation])} - p50 {c['p50']:.1f} µs, "
+                     f"p95 {c['p95']:.1f} µs, p99 {c['p99']:.1f} µs, max {c['max']:.1f} µs\n")
+        info += f"Locations refusées (aucun véhicule disponible): {self.locations_refusees}\n"
+        if self.memoire_par_jour:
+            info += (f"Mémoire: {self.memoire_par_jour[-1] / 1024:.0f} Kio en fin de simulation, "
+                     f"pic {self.memoire_pic / 1024:.0f} Kio, "
+                     f"croissance {self.croissance_memoire_par_semaine() / 1024:.1f} Kio/semaine")
+        else:
+            info += "Mémoire: non mesurée"
+        return info
+
+
+class Simulateur:
+    """
+    Simulateur à événements discrets du parc automobile
+    
+    Les recherches et les demandes de location arrivent selon des processus
+    de Poisson ; chaque location acceptée programme son retour après une
+    durée exponentielle. Chaque événement appelle le vrai code du domaine
+    (ParcAuto, Location, Date) et sa durée d'exécution réelle est mesurée.
+    À graine égale, la suite d'événements simulés est identique : la mémoire
+    est mesurée en rejouant la simulation sous tracemalloc, pour que son coût
+    ne fausse ni les latences ni le débit.
+    """
+    
+    MARQUES_VOITURES = (("Renault", ("Clio", "Megane", "Captur")), ("Peugeot", ("208", "308", "3008")),
+                        ("Citroën", ("C3", "C4")), ("Ford", ("Fiesta", "Focus")))
+    MARQUES_CAMIONS = (("Renault", ("Master", "Trafic")), ("Iveco", ("Daily",)),
+                       ("Mercedes", ("Sprinter",)))
+    
+    def __init__(self, configuration):
+        """
+        Initialise un simulateur
+        
+        Args:
+            configuration (ConfigurationSimulation): La configuration à simuler
+        """
+        self._config = configuration
+        self._aleatoire = random.Random(configuration.graine)
+        self._parc = None
+        self._clients = []
+        self._evenements = []
+        self._sequence = 0
+        self._nb_locations = 0
+        self._premier_jour = configuration.date_debut.vers_ordinal()
+    
+    def get_parc(self):
+        """Retourne le parc synthétique (None avant executer())"""
+        return self._parc
+    
+    def _creer_donnees(self):
+        """Crée le parc et les clients synthétiques"""
+        config = self._config
+        self._parc = ParcAuto("Simulation")
+        vehicules = []
+        for i in range(config.nb_vehicules):
+            # Le numéro de série dans le modèle évite les doublons refusés par ajouter_vehicule()
+            if self._aleatoire.random() < config.part_camions:
+                marque, modeles = self._aleatoire.choice(self.MARQUES_CAMIONS)
+                vehicules.append(Camion(marque, f"{self._aleatoire.choice(modeles)} #{i}",
+                                        self._aleatoire.randint(2015, 2025),
+                                        self._aleatoire.choice((3.5, 5.0, 7.2, 12.0))))
+            else:
+                marque, modeles = self._aleatoire.choice(self.MARQUES_VOITURES)
+                vehicules.append(Voiture(marque, f"{self._aleatoire.choice(modeles)} #{i}",
+                                         self._aleatoire.randint(2015, 2025),
+                                         self._aleatoire.choice((3, 5))))
+        self._parc.charger_vehicules(vehicules)
+        self._clients = [Client(f"CL{i:06d}", f"Client {i}") for i in range(config.nb_clients)]
+    
+    def _programmer(self, instant, operation, donnees=None):
+        heapq.heappush(self._evenements, (instant, self._sequence, operation, donnees))
+        self._sequence += 1
+    
+    def _date(self, instant):
+        """Retourne la Date du jour simulé contenant l'instant (en jours)"""
+        return Date.depuis_ordinal(self._premier_jour + int(instant))
+    
+    def executer(self):
+        """
+        Exécute la simulation
+        
+        Returns:
+            RapportSimulation: Les mesures de la simulation
+        """
+        config = self._config
+        rapport = RapportSimulation(config)
+        self._jouer(rapport, mesurer_memoire=False)
+        if config.suivre_memoire:
+            # À graine égale, un nouveau simulateur rejoue les mêmes événements
+            type(self)(config)._jouer(rapport, mesurer_memoire=True)
+        return rapport
+    
+    def _jouer(self, rapport, mesurer_memoire):
+        """
+        Joue la simulation et complète le rapport
+        
+        Args:
+            rapport (RapportSimulation): Le rapport à compléter
+            mesurer_memoire (bool): Mesurer la mémoire chaque jour simulé, sous
+                tracemalloc, au lieu des latences et du débit
+        """
+        config = self._config
+        fin = config.nb_semaines * 7
+        
+        # Le suivi déjà lancé par l'appelant est conservé tel quel
+        demarrer_suivi = mesurer_memoire and not tracemalloc.is_tracing()
+        if demarrer_suivi:
+            tracemalloc.start()
+        try:
+            self._creer_donnees()
+            if config.recherches_par_jour > 0:
+                self._programmer(self._aleatoire.expovariate(config.recherches_par_jour), RECHERCHE)
+            if config.locations_par_jour > 0:
+                self._programmer(self._aleatoire.expovariate(config.locations_par_jour), LOCATION)
+            
+            jour_mesure = 0
+            debut_reel = time.perf_counter()
+            while self._evenements and self._evenements[0][0] < fin:
+                instant, _, operation, donnees = heapq.heappop(self._evenements)
+                
+                if mesurer_memoire:
+                    while jour_mesure <= int(instant):
+                        self._mesurer_memoire(rapport)
+                        jour_mesure += 1
+                
+                t0 = time.perf_counter()
+                if operation == RECHERCHE:
+                    self._rechercher()
+                elif operation == LOCATION:
+                    if not self._louer(instant) and not mesurer_memoire:
+                        rapport.locations_refusees += 1
+                else:
+                    donnees.terminer(self._date(instant))
+                if not mesurer_memoire:
+                    rapport.latences[operation].append(time.perf_counter() - t0)
+                
+                # Arrivée suivante du même processus de Poisson
+                if operation == RECHERCHE:
+                    self._programmer(instant + self._aleatoire.expovariate(config.recherches_par_jour), RECHERCHE)
+                elif operation == LOCATION:
+                    self._programmer(instant + self._aleatoire.expovariate(config.locations_par_jour), LOCATION)
+            
+            if mesurer_memoire:
+                self._mesurer_memoire(rapport)
+            else:
+                rapport.duree_reelle = time.perf_counter() - debut_reel
+        finally:
+            if demarrer_suivi:
+                tracemalloc.stop()
+    
+    def _mesurer_memoire(self, rapport):
+        courante, pic = tracemalloc.get_traced_memory()
+        rapport.memoire_par_jour.append(courante)
+        rapport.memoire_pic = max(rapport.memoire_pic, pic)
+    
+    def _rechercher(self):
+        """Simule un écran de recherche : critères aléatoires, une page de résultats"""
+        criteres = {"disponible": True}
+        tirage = self._aleatoire.random()
+        if tirage < 0.4:
+            criteres["type_vehicule"] = self._aleatoire.choice(("Voiture", "Camion"))
+        elif tirage < 0.8:
+            marque, _ = self._aleatoire.choice(self.MARQUES_VOITURES + self.MARQUES_CAMIONS)
+            criteres["marque"] = marque
+        resultats = self._parc.requete(**criteres).limiter(self._config.taille_page).liste()
+        for vehicule in resultats:
+            vehicule.afficher_info()
+    
+    def _louer(self, instant):
+        """Simule une demande de location ; retourne False si aucun véhicule ne convient"""
+        type_vehicule = "Camion" if self._aleatoire.random() < self._config.part_camions else "Voiture"
+        vehicule = self._parc.requete(type_vehicule=type_vehicule, disponible=True).premier()
+        if vehicule is None:
+            return False
+        
+        self._nb_locations += 1
+        client = self._aleatoire.choice(self._clients)
+        location = Location(f"SIM{self._nb_locations:08d}", client, vehicule, self._date(instant))
+        retour = instant + self._aleatoire.expovariate(1 / self._config.duree_moyenne_location)
+        self._programmer(retour, RETOUR, location)
+        return True
+
+
+def comparer_configurations(configurations):
+    """
+    Exécute plusieurs simulations et met leurs mesures principales côte à côte
+    
+    Args:
+        configurations (list): Les configurations à simuler (ConfigurationSimulation)
+    
+    Returns:
+        str: Une ligne par configuration (débit, p95 des recherches et des locations, mémoire)
+    """
+    lignes = []
+    for numero, configuration in enumerate(configurations, 1):
+        rapport = Simulateur(configuration).executer()
+        memoire = (f"{rapport.memoire_par_jour[-1] / 1024:.0f} Kio" if rapport.memoire_par_jour
+                   else "non mesurée")
+        lignes.append(f"{numero}. {configuration.nb_vehicules} véhicules - {rapport.debit():.0f} op/s - "
+                      f"p95 recherche {rapport.centiles(RECHERCHE)['p95']:.1f} µs - "
+                      f"p95 location {rapport.centiles(LOCATION)['p95']:.1f} µs - mémoire {memoire}")
+    return "\n".join(lignes)
\ No newline at end of file
@@ -0,0 +1,71 @@
+import unittest
+
+from vehicule import Voiture
+from parc_auto import ParcAuto
+from date import Date
+from allocation import Allocateur, DemandeReservation
+
+
+class TestAllocateur(unittest.TestCase):
+    
+    def setUp(self):
+        self.parc = ParcAuto("Test")
+        self.voiture = Voiture("Renault", "Clio", 2022, 4)
+        self.parc.ajouter_vehicule(self.voiture)
+    
+    def test_demandes_du_meme_jour_ne_partagent_pas_un_vehicule(self):
+        jour = Date(5, 3, 2024)
+        demandes = [DemandeReservation(f"D{i}", "Voiture", jour, jour) for i in range(3)]
+        
+        resultat = Allocateur(self.parc).allouer(demandes)
+        
+        self.assertEqual(len(resultat.get_affectations()), 1)
+        self.assertEqual(len(resultat.get_non_satisfaites()), 2)
+    
+    def test_vehicule_rendu_reaffecte_le_jour_du_retour(self):
+        demandes = [DemandeReservation("D1", "Voiture", Date(1, 3, 2024), Date(5, 3, 2024)),
+                    DemandeReservation("D2", "Voiture", Date(5, 3, 2024), Date(5, 3, 2024)),
+                    DemandeReservation("D3", "Voiture", Date(6, 3, 2024), Date(8, 3, 2024))]
+        
+        resultat = Allocateur(self.parc).allouer(demandes)
+        
+        self.assertEqual(resultat.taux_satisfaction(), 1.0)
+        self.assertIs(resultat.vehicule_de("D2"), self.voiture)
+    
+    
+    def _parc_fiat_renault(self):
+        """Parc où la Fiat précède la Renault, qui se libère donc « plus tard » à égalité"""
+        parc = ParcAuto("Marques")
+        fiat = Voiture("Fiat", "Panda", 2021, 5)
+        renault = Voiture("Renault", "Clio", 2022, 4)
+        parc.ajouter_vehicule(fiat)
+        parc.ajouter_vehicule(renault)
+        return parc, fiat, renault
+    
+    def test_demande_sans_marque_laisse_le_vehicule_exige_par_une_autre(self):
+        parc, fiat, renault = self._parc_fiat_renault()
+        debut, fin = Date(1, 3, 2024), Date(3, 3, 2024)
+        for ordre in ((None, "Renault"), ("Renault", None)):
+            demandes = [DemandeReservation(f"D{i}", "Voiture", debut, fin, marque)
+                        for i, marque in enumerate(ordre)]
+            
+            resultat = Allocateur(parc).allouer(demandes)
+            
+            self.assertEqual(resultat.taux_satisfaction(), 1.0)
+            self.assertIs(resultat.vehicule_de(f"D{ordre.index('Renault')}"), renault)
+            self.assertIs(resultat.vehicule_de(f"D{ordre.index(None)}"), fiat)
+    
+    def test_demande_sans_marque_evite_la_marque_sollicitee_sur_sa_periode(self):
+        parc, fiat, renault = self._parc_fiat_renault()
+        demandes = [DemandeReservation("Libre", "Voiture", Date(1, 3, 2024), Date(2, 3, 2024)),
+                    DemandeReservation("Renault", "Voiture", Date(1, 3, 2024), Date(4, 3, 2024), "Renault"),
+                    DemandeReservation("Fiat", "Voiture", Date(10, 3, 2024), Date(12, 3, 2024), "Fiat")]
+        
+        resultat = Allocateur(parc).allouer(demandes)
+        
+        self.assertEqual(resultat.taux_satisfaction(), 1.0)
+        self.assertIs(resultat.vehicule_de("Libre"), fiat)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
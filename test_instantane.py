@@ -0,0 +1,53 @@
+import unittest
+
+from vehicule import Voiture, Camion
+from parc_auto import ParcAuto
+
+
+class TestInstantaneParc(unittest.TestCase):
+    
+    def setUp(self):
+        self.parc = ParcAuto("Test")
+        self.voiture = Voiture("Renault", "Clio", 2022, 4)
+        self.camion = Camion("Iveco", "Daily", 2021, 3.5)
+        self.parc.ajouter_vehicule(self.voiture)
+        self.parc.ajouter_vehicule(self.camion)
+    
+    def test_vue_creee_avant_une_modification_garde_l_etat_de_l_instantane(self):
+        instantane = self.parc.instantane()
+        vues = instantane.get_vehicules()
+        affichage = vues[0].afficher_info()
+        
+        self.voiture.louer()
+        self.voiture.set_marque("Peugeot")
+        
+        self.assertTrue(vues[0].est_disponible())
+        self.assertEqual(vues[0].get_marque(), "Renault")
+        self.assertEqual(vues[0].afficher_info(), affichage)
+        self.assertFalse(self.voiture.est_disponible())
+    
+    def test_comptage_puis_listing_coherents_malgre_les_modifications(self):
+        instantane = self.parc.instantane()
+        disponibles = instantane.rechercher_vehicule(disponible=True)
+        
+        self.camion.louer()
+        self.parc.supprimer_vehicule(self.voiture)
+        self.parc.ajouter_vehicule(Voiture("Ford", "Fiesta", 2020, 4))
+        
+        self.assertEqual([vue.est_disponible() for vue in disponibles], [True, True])
+        self.assertEqual(instantane.compter_vehicules(disponible=True), 2)
+        self.assertIn("Véhicules disponibles: 2, Véhicules loués: 0", instantane.afficher_parc())
+    
+    def test_lecture_apres_liberation_refusee(self):
+        instantane = self.parc.instantane()
+        vues = instantane.get_vehicules()
+        instantane.liberer()
+        
+        with self.assertRaises(ValueError):
+            instantane.get_vehicules()
+        with self.assertRaises(ValueError):
+            vues[0].est_disponible()
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,41 @@
+import unittest
+
+from vehicule import Voiture
+from client import Client
+from date import Date
+from location import Location
+from occupation import RegistreOccupation
+
+
+class TestRegistreOccupation(unittest.TestCase):
+    
+    def setUp(self):
+        self.client = Client("Dupont", "Jean")
+        self.voiture = Voiture("Renault", "Clio", 2022, 4)
+        self.registre = RegistreOccupation(jusqu_au=Date(10, 3, 2024))
+    
+    def test_location_en_cours_occupe_jusqu_au_jour_de_reference(self):
+        location = Location("L1", self.client, self.voiture, Date(1, 3, 2024))
+        self.registre.enregistrer(location)
+        
+        self.assertEqual(self.registre.jours_occupes(self.voiture, 2024), 10)
+        self.assertEqual(self.registre.jour_de_pointe([self.voiture], 2024)[1], 1)
+        
+        self.registre.set_jusqu_au(Date(20, 3, 2024))
+        self.assertEqual(self.registre.jours_occupes(self.voiture, 2024), 20)
+        
+        location.terminer(Date(5, 3, 2024))
+        self.assertEqual(self.registre.jours_occupes(self.voiture, 2024), 4)
+    
+    def test_date_modifiee_sur_place(self):
+        location = Location("L1", self.client, self.voiture, Date(1, 3, 2024), Date(10, 3, 2024))
+        self.registre.enregistrer(location)
+        self.assertEqual(self.registre.jours_occupes(self.voiture, 2024), 9)
+        
+        location.get_date_debut().set_jour(5)
+        
+        self.assertEqual(self.registre.taux_utilisation_flotte([self.voiture], 2024, 3), 5 / 31)
+
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
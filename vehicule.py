@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
+from evenement import Observable, VehiculeModifie, VehiculeLoue, VehiculeRendu
+from catalogue import CATALOGUE
 
-class Vehicule(ABC):
-    """Classe abstraite représentant un véhicule"""
+class Vehicule(Observable, ABC):
+    """
+    Classe abstraite représentant un véhicule
     
-    def __init__(self, marque, modele, annee):
+    Les caractéristiques (marque, modèle, année, nombre de portes ou capacité)
+    sont rangées dans une fiche immuable du catalogue, partagée par tous les
+    véhicules identiques : un véhicule ne stocke que sa fiche et sa
+    disponibilité. Les setters remplacent la fiche par celle des nouvelles
+    caractéristiques.
+    
+    Les événements du véhicule sont publiés sur son propre bus, s'il a des
+    abonnés, et sur le canal de chaque parc qui le contient : un parc suit
+    ainsi tous ses véhicules sans créer un bus par véhicule.
+    """
+    
+    __slots__ = ("_fiche", "_disponible", "_bus", "_canaux", "__weakref__")
+    
+    def __init__(self, marque, modele, annee, detail=None):
         """
         Initialise un véhicule avec sa marque, son modèle et son année
         
@@ -11,16 +27,104 @@ class Vehicule(ABC):
             marque (str): La marque du véhicule
             modele (str): Le modèle du véhicule
             annee (int): L'année de fabrication du véhicule
+            detail (optional): La caractéristique propre au type de véhicule
+                (nombre de portes ou capacité). Defaults to None.
         """
-        self._marque = marque
-        self._modele = modele
-        self._annee = annee
+        self._fiche = CATALOGUE.fiche(type(self), marque, modele, annee, detail)
         self._disponible = True
+        self._bus = None
+        self._canaux = None  # Canal du parc qui contient le véhicule, ou tuple de canaux
+    
+    def __copy__(self):
+        """
+        Copie le véhicule, sans ses abonnés
+        
+        La copie ne fait partie d'aucun parc : elle ne doit partager ni le
+        bus d'événements ni les canaux de l'original.
+        
+        Returns:
+            Vehicule: Un véhicule de même fiche et de même disponibilité
+        """
+        copie = type(self).__new__(type(self))
+        copie._fiche = self._fiche
+        copie._disponible = self._disponible
+        copie._bus = None
+        copie._canaux = None
+        return copie
+    
+    def __deepcopy__(self, memo):
+        # La fiche est immuable : rien de plus à copier en profondeur
+        return self.__copy__()
+    
+    def __getstate__(self):
+        """
+        Retourne l'état à sérialiser (pickle) : caractéristiques et disponibilité
+        
+        Les abonnés et les canaux ne sont pas sérialisés ; la fiche est retrouvée dans le
+        catalogue à la désérialisation pour rester partagée.
+        """
+        fiche = self._fiche
+        etat = {"caracteristiques": (fiche.get_marque(), fiche.get_modele(), fiche.get_annee(), fiche.get_detail()),
+                "disponible": self._disponible}
+        if hasattr(self, "__dict__"):
+            # Attributs des classes filles sans __slots__
+            etat["attributs"] = self.__dict__.copy()
+            etat["attributs"].pop("_bus", None)
+        return etat
+    
+    def __setstate__(self, etat):
+        """Restaure un véhicule sérialisé, sans abonné"""
+        self._fiche = CATALOGUE.fiche(type(self), *etat["caracteristiques"])
+        self._disponible = etat["disponible"]
+        self._bus = None
+        self._canaux = None
+        if "attributs" in etat:
+            self.__dict__.update(etat["attributs"])
+    
+    def _rejoindre_canal(self, canal):
+        """Publie aussi les événements du véhicule sur un canal (bus partagé d'un parc)"""
+        canaux = self._canaux
+        if canaux is None:
+            self._canaux = canal
+        elif type(canaux) is tuple:
+            self._canaux = canaux + (canal,)
+        else:
+            self._canaux = (canaux, canal)
+    
+    def _quitter_canal(self, canal):
+        """Cesse de publier les événements du véhicule sur un canal"""
+        canaux = self._canaux
+        if canaux is canal:
+            self._canaux = None
+        elif type(canaux) is tuple:
+            restants = tuple(c for c in canaux if c is not canal)
+            self._canaux = restants[0] if len(restants) == 1 else restants
+    
+    def _publier(self, evenement):
+        """Publie un événement sur le bus du véhicule et sur ses canaux"""
+        if self._bus is not None:
+            self._bus.publier(evenement)
+        canaux = self._canaux
+        if type(canaux) is tuple:
+            for canal in canaux:
+                canal.publier(evenement)
+        elif canaux is not None:
+            canaux.publier(evenement)
+    
+    def get_fiche(self):
+        """Retourne la fiche partagée des caractéristiques du véhicule"""
+        return self._fiche
+    
+    def _changer_fiche(self, attribut, ancienne_valeur, nouvelle_valeur, marque, modele, annee, detail):
+        """Remplace la fiche du véhicule et annonce la modification de l'attribut"""
+        self._fiche = CATALOGUE.fiche(type(self), marque, modele, annee, detail)
+        if self._bus is not None or self._canaux is not None:
+            self._publier(VehiculeModifie(self, attribut, ancienne_valeur, nouvelle_valeur))
     
     # Getters et setters pour marque
     def get_marque(self):
         """Retourne la marque du véhicule"""
-        return self._marque
+        return self._fiche.get_marque()
     
     def set_marque(self, marque):
         """
@@ -29,12 +133,14 @@ class Vehicule(ABC):
         Args:
             marque (str): La nouvelle marque du véhicule
         """
-        self._marque = marque
+        fiche = self._fiche
+        self._changer_fiche("marque", fiche.get_marque(), marque,
+                            marque, fiche.get_modele(), fiche.get_annee(), fiche.get_detail())
     
     # Getters et setters pour modele
     def get_modele(self):
         """Retourne le modèle du véhicule"""
-        return self._modele
+        return self._fiche.get_modele()
     
     def set_modele(self, modele):
         """
@@ -43,12 +149,14 @@ class Vehicule(ABC):
         Args:
             modele (str): Le nouveau modèle du véhicule
         """
-        self._modele = modele
+        fiche = self._fiche
+        self._changer_fiche("modele", fiche.get_modele(), modele,
+                            fiche.get_marque(), modele, fiche.get_annee(), fiche.get_detail())
     
     # Getters et setters pour annee
     def get_annee(self):
         """Retourne l'année de fabrication du véhicule"""
-        return self._annee
+        return self._fiche.get_annee()
     
     def set_annee(self, annee):
         """
@@ -57,7 +165,9 @@ class Vehicule(ABC):
         Args:
             annee (int): La nouvelle année de fabrication du véhicule
         """
-        self._annee = annee
+        fiche = self._fiche
+        self._changer_fiche("annee", fiche.get_annee(), annee,
+                            fiche.get_marque(), fiche.get_modele(), annee, fiche.get_detail())
     
     # Getters et setters pour disponible
     def est_disponible(self):
@@ -71,7 +181,10 @@ class Vehicule(ABC):
         Args:
             disponible (bool): La nouvelle disponibilité du véhicule
         """
+        ancienne_valeur = self._disponible
         self._disponible = disponible
+        if self._bus is not None or self._canaux is not None:
+            self._publier(VehiculeModifie(self, "disponible", ancienne_valeur, disponible))
     
     def louer(self):
         """
@@ -82,6 +195,8 @@ class Vehicule(ABC):
         """
         if self._disponible:
             self._disponible = False
+            if self._bus is not None or self._canaux is not None:
+                self._publier(VehiculeLoue(self))
             return True
         return False
     
@@ -94,6 +209,8 @@ class Vehicule(ABC):
         """
         if not self._disponible:
             self._disponible = True
+            if self._bus is not None or self._canaux is not None:
+                self._publier(VehiculeRendu(self))
             return True
         return False
     
@@ -102,6 +219,45 @@ class Vehicule(ABC):
         """Méthode abstraite pour afficher les informations du véhicule"""
         pass
     
+    def donnees_info(self):
+        """
+        Retourne les valeurs affichées par afficher_info()
+        
+        Les classes filles qui séparent leurs données de leur mise en forme
+        (formater_info) la redéfinissent ; sans elle, le rendu parallèle et les
+        instantanés se rabattent sur afficher_info().
+        
+        Returns:
+            tuple: Les arguments de formater_info() pour ce véhicule, ou None
+        """
+        return None
+    
+    def info_en_cache(self):
+        """Retourne la chaîne d'afficher_info() en cache, ou None si elle est à recalculer"""
+        return self._fiche.info_en_cache(self._disponible)
+    
+    def memoriser_info(self, info):
+        """
+        Place en cache une chaîne d'informations calculée ailleurs (rendu parallèle)
+        
+        Args:
+            info (str): La chaîne retournée par formater_info(*self.donnees_info())
+        """
+        self._fiche.memoriser_info(self._disponible, info)
+    
+    def cle_tarif(self):
+        """
+        Retourne une clé qui change dès qu'un attribut utilisé par calculer_prix_location() change
+        
+        Les locations s'en servent pour savoir si leur prix en cache est encore
+        valide. Les caractéristiques étant dans la fiche, remplacée par chaque
+        setter, la fiche elle-même sert de clé.
+        
+        Returns:
+            FicheVehicule: La fiche du véhicule
+        """
+        return self._fiche
+    
     @abstractmethod
     def calculer_prix_location(self, nb_jours):
         """
@@ -119,6 +275,11 @@ class Vehicule(ABC):
 class Voiture(Vehicule):
     """Classe représentant une voiture, hérite de Vehicule"""
     
+    __slots__ = ()
+    
+    # Noms des valeurs retournées par donnees_info(), dans l'ordre
+    ATTRIBUTS_INFO = ("marque", "modele", "annee", "nb_portes", "disponible")
+    
     def __init__(self, marque, modele, annee, nb_portes):
         """
         Initialise une voiture avec sa marque, son modèle, son année et son nombre de portes
@@ -129,13 +290,12 @@ class Voiture(Vehicule):
             annee (int): L'année de fabrication de la voiture
             nb_portes (int): Le nombre de portes de la voiture
         """
-        super().__init__(marque, modele, annee)
-        self._nb_portes = nb_portes
+        super().__init__(marque, modele, annee, nb_portes)
     
     # Getter et setter pour nb_portes
     def get_nb_portes(self):
         """Retourne le nombre de portes de la voiture"""
-        return self._nb_portes
+        return self._fiche.get_detail()
     
     def set_nb_portes(self, nb_portes):
         """
@@ -144,17 +304,40 @@ class Voiture(Vehicule):
         Args:
             nb_portes (int): Le nouveau nombre de portes de la voiture
         """
-        self._nb_portes = nb_portes
+        fiche = self._fiche
+        self._changer_fiche("nb_portes", fiche.get_detail(), nb_portes,
+                            fiche.get_marque(), fiche.get_modele(), fiche.get_annee(), nb_portes)
+    
+    @staticmethod
+    def formater_info(marque, modele, annee, nb_portes, disponible):
+        """
+        Met en forme les informations d'une voiture
+        
+        Returns:
+            str: Une chaîne contenant les informations de la voiture
+        """
+        disponibilite = "Disponible" if disponible else "Non disponible"
+        return f"Voiture {marque} {modele} ({annee}) - {nb_portes} portes - {disponibilite}"
+    
+    def donnees_info(self):
+        """Retourne (marque, modele, annee, nb_portes, disponible)"""
+        return (self.get_marque(), self.get_modele(), self.get_annee(), self.get_nb_portes(), self.est_disponible())
     
     def afficher_info(self):
         """
         Affiche les informations de la voiture
         
+        La chaîne est mise en cache dans la fiche du véhicule, pour chaque
+        disponibilité : les véhicules identiques la calculent une seule fois.
+        
         Returns:
             str: Une chaîne contenant les informations de la voiture
         """
-        disponibilite = "Disponible" if self.est_disponible() else "Non disponible"
-        return f"Voiture {self.get_marque()} {self.get_modele()} ({self.get_annee()}) - {self.get_nb_portes()} portes - {disponibilite}"
+        info = self._fiche.info_en_cache(self._disponible)
+        if info is None:
+            info = self.formater_info(*self.donnees_info())
+            self._fiche.memoriser_info(self._disponible, info)
+        return info
     
     def calculer_prix_location(self, nb_jours):
         """
@@ -173,6 +356,11 @@ class Voiture(Vehicule):
 class Camion(Vehicule):
     """Classe représentant un camion, hérite de Vehicule"""
     
+    __slots__ = ()
+    
+    # Noms des valeurs retournées par donnees_info(), dans l'ordre
+    ATTRIBUTS_INFO = ("marque", "modele", "annee", "capacite", "disponible")
+    
     def __init__(self, marque, modele, annee, capacite):
         """
         Initialise un camion avec sa marque, son modèle, son année et sa capacité
@@ -183,13 +371,12 @@ class Camion(Vehicule):
             annee (int): L'année de fabrication du camion
             capacite (float): La capacité en tonnes du camion
         """
-        super().__init__(marque, modele, annee)
-        self._capacite = capacite
+        super().__init__(marque, modele, annee, capacite)
     
     # Getter et setter pour capacite
     def get_capacite(self):
         """Retourne la capacité du camion en tonnes"""
-        return self._capacite
+        return self._fiche.get_detail()
     
     def set_capacite(self, capacite):
         """
@@ -198,17 +385,40 @@ class Camion(Vehicule):
         Args:
             capacite (float): La nouvelle capacité du camion en tonnes
         """
-        self._capacite = capacite
+        fiche = self._fiche
+        self._changer_fiche("capacite", fiche.get_detail(), capacite,
+                            fiche.get_marque(), fiche.get_modele(), fiche.get_annee(), capacite)
+    
+    @staticmethod
+    def formater_info(marque, modele, annee, capacite, disponible):
+        """
+        Met en forme les informations d'un camion
+        
+        Returns:
+            str: Une chaîne contenant les informations du camion
+        """
+        disponibilite = "Disponible" if disponible else "Non disponible"
+        return f"Camion {marque} {modele} ({annee}) - Capacité: {capacite} tonnes - {disponibilite}"
+    
+    def donnees_info(self):
+        """Retourne (marque, modele, annee, capacite, disponible)"""
+        return (self.get_marque(), self.get_modele(), self.get_annee(), self.get_capacite(), self.est_disponible())
     
     def afficher_info(self):
         """
         Affiche les informations du camion
         
+        La chaîne est mise en cache dans la fiche du véhicule, pour chaque
+        disponibilité : les véhicules identiques la calculent une seule fois.
+        
         Returns:
             str: Une chaîne contenant les informations du camion
         """
-        disponibilite = "Disponible" if self.est_disponible() else "Non disponible"
-        return f"Camion {self.get_marque()} {self.get_modele()} ({self.get_annee()}) - Capacité: {self.get_capacite()} tonnes - {disponibilite}"
+        info = self._fiche.info_en_cache(self._disponible)
+        if info is None:
+            info = self.formater_info(*self.donnees_info())
+            self._fiche.memoriser_info(self._disponible, info)
+        return info
     
     def calculer_prix_location(self, nb_jours):
         """